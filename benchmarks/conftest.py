@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Synthetic settings classes and sources for benchmarks"""
+import pytest
+
+from magic_settings import (BaseSettings, BoolProperty, IntProperty, StringListProperty, StringProperty,
+                            TransformsComplexProperty)
+
+SIZES = [10, 100, 1000]
+
+# property class and raw string value, cycled over synthetic properties
+PROPERTY_KINDS = [
+    (StringProperty, 'value'),
+    (IntProperty, '42'),
+    (BoolProperty, 'true'),
+    (StringListProperty, 'a,b,c'),
+]
+
+
+def make_settings_class(size):
+    """Settings class with ``size`` properties named ``PROPERTY_<index>``"""
+    namespace = {
+        f'PROPERTY_{index}': PROPERTY_KINDS[index % len(PROPERTY_KINDS)][0]()
+        for index in range(size)
+    }
+    return type(f'Settings{size}', (BaseSettings,), namespace)
+
+
+def make_raw_config(size):
+    """Raw string values for all properties of settings class made by make_settings_class"""
+    return {f'PROPERTY_{index}': PROPERTY_KINDS[index % len(PROPERTY_KINDS)][1] for index in range(size)}
+
+
+def make_environ(size, prefix='BENCH_'):
+    """Environment with ``size`` variables without prefix and values for properties of 100 properties class"""
+    environ = {f'UNRELATED_VARIABLE_{index}': 'value' for index in range(size)}
+    environ.update({f'{prefix}{name}': value for name, value in make_raw_config(100).items()})
+    return environ
+
+
+class TransformsSettings(BaseSettings):
+    HOST = StringProperty(default='localhost')
+    PORT = IntProperty(default=5432)
+    USER = StringProperty(default='user')
+    DSN = TransformsComplexProperty(
+        keys={'host': HOST, 'port': PORT, 'user': USER},
+        transforms=[lambda host, port, user: f'postgresql://{user}@{host}:{port}'],
+    )
+    UNCACHED_DSN = TransformsComplexProperty(
+        keys={'host': HOST, 'port': PORT, 'user': USER},
+        transforms=[lambda host, port, user: f'postgresql://{user}@{host}:{port}'],
+        cached=False,
+    )
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f'{size}-properties')
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def settings_class(size):
+    return make_settings_class(size)
+
+
+@pytest.fixture
+def raw_config(size):
+    return make_raw_config(size)
+
+
+@pytest.fixture
+def initialized_settings(settings_class, raw_config):
+    settings = settings_class(use_env=False)
+    settings.update_config(**raw_config)
+    return settings
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Attribute reads through properties descriptors against frozen snapshot"""
+import pytest
+
+from magic_settings import BaseSettings, IntProperty, StringProperty
+
+READS_NUMBER = 1000
+
+
+class Settings(BaseSettings):
+    HOST = StringProperty(default='localhost')
+    PORT = IntProperty(default=8080)
+
+
+@pytest.fixture(scope='module')
+def settings():
+    settings = Settings(use_env=False)
+    settings.init()
+    return settings
+
+
+def read_loop(settings):
+    for _ in range(READS_NUMBER):
+        settings.HOST
+        settings.PORT
+
+
+@pytest.mark.benchmark(group='read')
+def test_descriptor_read(benchmark, settings):
+    benchmark(read_loop, settings)
+
+
+@pytest.mark.benchmark(group='read')
+def test_frozen_read(benchmark, settings):
+    benchmark(read_loop, settings.freeze())
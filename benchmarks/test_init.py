@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""BaseSettings.init with synthetic settings from module, environment and yaml sources"""
+import os
+import types
+from unittest import mock
+
+import pytest
+import yaml
+
+from conftest import make_environ
+
+ENVIRON_SIZE = 10000
+
+
+@pytest.fixture
+def module(raw_config):
+    module = types.ModuleType('bench_settings')
+    module.__dict__.update(raw_config)
+    return module
+
+
+@pytest.fixture
+def yaml_path(tmp_path, raw_config):
+    path = tmp_path / 'settings.yaml'
+    path.write_text(yaml.safe_dump(raw_config))
+    return str(path)
+
+
+@pytest.fixture
+def environ():
+    with mock.patch.dict(os.environ, make_environ(ENVIRON_SIZE)):
+        yield
+
+
+@pytest.mark.benchmark(group='init-module')
+def test_init_module(benchmark, settings_class, module):
+    benchmark(settings_class(modules=[module], use_env=False).init)
+
+
+@pytest.mark.benchmark(group='init-yaml')
+def test_init_yaml(benchmark, settings_class, yaml_path):
+    benchmark(settings_class(yaml_settings_path=yaml_path, use_env=False).init)
+
+
+@pytest.mark.benchmark(group='init-yaml')
+def test_init_yaml_incremental(benchmark, settings_class, yaml_path):
+    settings = settings_class(yaml_settings_path=yaml_path, use_env=False)
+    settings.init()
+    benchmark(settings.init, incremental=True)
+
+
+@pytest.mark.benchmark(group='init-env')
+@pytest.mark.parametrize('declared_env_only', [False, True], ids=['scan', 'declared'])
+def test_init_env(benchmark, settings_class, module, environ, declared_env_only):
+    settings = settings_class(modules=[module], prefix='BENCH', declared_env_only=declared_env_only)
+    benchmark(settings.init)
+
+
+@pytest.mark.benchmark(group='init-lazy')
+@pytest.mark.parametrize('lazy', [False, True], ids=['eager', 'lazy'])
+def test_init_lazy(benchmark, settings_class, module, lazy):
+    benchmark(settings_class(modules=[module], use_env=False).init, lazy=lazy)
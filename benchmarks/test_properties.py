@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""BaseProperty.__get__ and BaseProperty.__set__ for all properties of synthetic settings"""
+import pytest
+
+from conftest import TransformsSettings
+
+READS_NUMBER = 1000
+
+
+@pytest.mark.benchmark(group='property-get')
+def test_get(benchmark, initialized_settings, raw_config):
+    names = list(raw_config)
+
+    def read_all():
+        for name in names:
+            getattr(initialized_settings, name)
+
+    benchmark(read_all)
+
+
+@pytest.mark.benchmark(group='property-set')
+def test_set(benchmark, initialized_settings, raw_config):
+    benchmark(initialized_settings.update_config, **raw_config)
+
+
+@pytest.mark.benchmark(group='property-set')
+def test_apply_config(benchmark, initialized_settings, raw_config):
+    benchmark(initialized_settings.apply_config, **raw_config)
+
+
+@pytest.mark.benchmark(group='transforms-get')
+@pytest.mark.parametrize('name', ['DSN', 'UNCACHED_DSN'])
+def test_transforms_get(benchmark, name):
+    settings = TransformsSettings()
+
+    def read_loop():
+        for _ in range(READS_NUMBER):
+            getattr(settings, name)
+
+    benchmark(read_loop)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""BaseSettings.to_dict and BaseSettings.to_json of synthetic settings"""
+import pytest
+
+
+@pytest.mark.benchmark(group='to-dict')
+def test_to_dict(benchmark, initialized_settings):
+    benchmark(initialized_settings.to_dict)
+
+
+@pytest.mark.benchmark(group='to-json')
+def test_to_json(benchmark, initialized_settings):
+    benchmark(initialized_settings.to_json)
+
+
+@pytest.mark.benchmark(group='to-json')
+def test_to_json_after_set(benchmark, initialized_settings):
+    """Cached json is dropped by every set"""
+    def set_and_dump():
+        initialized_settings.PROPERTY_0 = initialized_settings.PROPERTY_0
+        return initialized_settings.to_json()
+
+    benchmark(set_and_dump)
+
+
+@pytest.mark.benchmark(group='to-json')
+def test_to_json_subset(benchmark, initialized_settings):
+    benchmark(initialized_settings.to_json, ['PROPERTY_0', 'PROPERTY_1'])
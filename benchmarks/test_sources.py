@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Reading config dicts from environment and yaml sources"""
+import pytest
+import yaml
+
+from conftest import make_environ, make_raw_config
+from magic_settings.utils import _get_config_dict_from_env, _get_config_dict_from_yaml
+
+ENVIRON_SIZE = 10000
+YAML_SIZES = [1000, 5000]
+
+
+@pytest.fixture(scope='module')
+def environ():
+    return make_environ(ENVIRON_SIZE)
+
+
+@pytest.mark.benchmark(group='env')
+@pytest.mark.parametrize('prefix', ['', 'BENCH'])
+def test_env_scan(benchmark, environ, prefix):
+    benchmark(_get_config_dict_from_env, prefix=prefix, environ=environ)
+
+
+@pytest.mark.benchmark(group='env')
+def test_env_declared(benchmark, environ):
+    benchmark(_get_config_dict_from_env, prefix='BENCH', environ=environ, names=list(make_raw_config(100)))
+
+
+@pytest.mark.benchmark(group='yaml')
+@pytest.mark.parametrize('size', YAML_SIZES)
+def test_yaml(benchmark, tmp_path, size):
+    path = tmp_path / 'settings.yaml'
+    path.write_text(yaml.safe_dump(make_raw_config(size)))
+    benchmark(_get_config_dict_from_yaml, str(path))
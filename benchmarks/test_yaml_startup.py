@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Settings startup with large yaml file: pure python loader, libyaml loader and parsed dict cache"""
+import pytest
+import yaml
+
+from magic_settings import BaseSettings, StringProperty
+
+KEYS_NUMBER = 3000
+
+Settings = type('Settings', (BaseSettings,), {f'KEY_{index}': StringProperty() for index in range(KEYS_NUMBER)})
+
+
+@pytest.fixture(scope='module')
+def yaml_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('yaml') / 'settings.yaml'
+    path.write_text(''.join(f'KEY_{index}: "value {index}"\n' for index in range(KEYS_NUMBER)))
+    return str(path)
+
+
+@pytest.mark.benchmark(group='yaml-parse')
+def test_pure_python_loader(benchmark, yaml_path):
+    with open(yaml_path, 'rb') as file:
+        content = file.read()
+    benchmark(yaml.load, content, Loader=yaml.SafeLoader)
+
+
+@pytest.mark.skipif(not hasattr(yaml, 'CSafeLoader'), reason='PyYaml is built without libyaml')
+@pytest.mark.benchmark(group='yaml-parse')
+def test_libyaml_loader(benchmark, yaml_path):
+    with open(yaml_path, 'rb') as file:
+        content = file.read()
+    benchmark(yaml.load, content, Loader=yaml.CSafeLoader)
+
+
+@pytest.mark.benchmark(group='yaml-startup')
+def test_startup(benchmark, yaml_path):
+    benchmark(lambda: Settings(yaml_settings_path=yaml_path, use_env=False).init())
+
+
+@pytest.mark.benchmark(group='yaml-startup')
+def test_startup_cached(benchmark, yaml_path, tmp_path):
+    Settings(yaml_settings_path=yaml_path, yaml_cache_dir=str(tmp_path), use_env=False).init()
+    benchmark(lambda: Settings(yaml_settings_path=yaml_path, yaml_cache_dir=str(tmp_path), use_env=False).init())
@@ -7,6 +7,10 @@ from .utils import (
     NoneType,
     Undefined,
     BaseSettings,
+    FrozenSettings,
+    InitStats,
+    InitSummary,
+    SettingsValidationError,
     BaseProperty,
     ComplexProperty,
     TransformsMixin,
@@ -25,12 +29,16 @@ from .special_property import (
 )
 
 from .dynamic_settings_base import BaseDynamicSettings, DynamicSettingsSourceError
+from .scheduler import RefreshScheduler, RefreshStats
+from .file_dynamic_settings import FileDynamicSettings
+from .snapshot import SharedSnapshot, SnapshotError
 
 __version__ = '1.2.0'
 
 __all__ = [
-    'NoneType', 'Undefined', 'BaseSettings', 'BaseProperty',
-    'ComplexProperty', 'TransformsMixin', 'Property', 'TransformsProperty',
+    'NoneType', 'Undefined', 'BaseSettings', 'FrozenSettings', 'InitStats', 'InitSummary', 'SettingsValidationError',
+    'BaseProperty', 'ComplexProperty', 'TransformsMixin', 'Property', 'TransformsProperty',
     'TransformsComplexProperty', 'BaseDynamicSettings', 'DynamicSettingsSourceError',
+    'RefreshScheduler', 'RefreshStats', 'FileDynamicSettings', 'SharedSnapshot', 'SnapshotError',
     'BoolProperty', 'FloatProperty', 'IntProperty', 'StringListProperty', 'StringProperty', 'HostListProperty'
 ]
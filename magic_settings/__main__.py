@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Command line interface.
+
+python -m magic_settings compile my_project.config:settings settings.snapshot
+"""
+import argparse
+import importlib
+import sys
+
+from magic_settings import BaseSettings, __version__
+from magic_settings.snapshot import write_snapshot
+
+
+def _load_settings(reference: str) -> BaseSettings:
+    """
+    Import settings by reference
+    :param reference: module:name of settings instance or of settings class taking no parameters
+    :raises ValueError: if reference is not valid
+    """
+    module_name, _, name = reference.partition(':')
+    if not module_name or not name:
+        raise ValueError(f'Settings reference should be module:name, got {reference}')
+
+    settings = importlib.import_module(module_name)
+    for attribute in name.split('.'):
+        settings = getattr(settings, attribute)
+
+    if isinstance(settings, type) and issubclass(settings, BaseSettings):
+        settings = settings()
+    if not isinstance(settings, BaseSettings):
+        raise ValueError(f'{reference} is not settings instance or class')
+    return settings
+
+
+def compile_settings(reference: str, output: str):
+    """Initialize settings from sources and write their values to snapshot file"""
+    settings = _load_settings(reference)
+    settings.init()
+    write_snapshot(settings, output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m magic_settings', description='magic-settings tools')
+    parser.add_argument('--version', action='version', version=__version__)
+    commands = parser.add_subparsers(dest='command')
+
+    compile_parser = commands.add_parser('compile', help='initialize settings and write snapshot file')
+    compile_parser.add_argument('settings', help='module:name of settings instance or class')
+    compile_parser.add_argument('output', help='path to snapshot file')
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    try:
+        compile_settings(args.settings, args.output)
+    except (ImportError, AttributeError, ValueError) as e:
+        print(f'Failed to compile settings: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import hashlib
+import json
 import logging
 from abc import ABC, abstractmethod
 
 from magic_settings import BaseSettings
+from magic_settings.scheduler import get_scheduler
+from magic_settings.utils import ComplexProperty, _dependencies
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +18,31 @@ class DynamicSettingsSourceError(Exception):
 
 
 class BaseDynamicSettings(BaseSettings, ABC):
-    def __init__(self, loop, update_period, task_retries_number=3):
+    # callback -> frozenset of watched properties names or None if all properties are watched
+    _subscriptions = None
+    # version token of the last payload applied with apply_source_payload
+    source_version = None
+    # values of properties subscribers were last notified of, changes are found against them
+    _notified_values = None
+
+    def __init__(self, loop, update_period, task_retries_number=3, scheduler=None, **kwargs):
+        """
+        :param loop: event loop of the update task
+        :param update_period: time between updates from source, in seconds
+        :param task_retries_number: number of consecutive errors after which the update task stops
+        :param scheduler: RefreshScheduler to refresh settings from instead of own update task,
+            True for the process-wide scheduler. Scheduler keeps refreshing after errors
+        :param kwargs: parameters of BaseSettings for init and ainit
+        """
+        super().__init__(**kwargs)
         self.loop = loop
         self.update_period = update_period
         self.task = None
 
         self.task_retries_number = task_retries_number
+        if scheduler is True:
+            scheduler = get_scheduler()
+        self.scheduler = scheduler
 
     @abstractmethod
     async def update_settings_from_source(self):
@@ -31,7 +54,7 @@ class BaseDynamicSettings(BaseSettings, ABC):
         retries_left = self.task_retries_number
         while retries_left >= 0:
             try:
-                await self.update_settings_from_source()
+                await self.refresh()
             except asyncio.CancelledError:
                 raise
             except Exception:
@@ -44,12 +67,145 @@ class BaseDynamicSettings(BaseSettings, ABC):
 
     async def start_update(self):
         """Start updating task"""
+        if self.scheduler is not None:
+            self.scheduler.add(self)
+            return
         self.task = self.loop.create_task(self._periodic())
 
     async def stop_update(self):
         """Stop updating task"""
+        if self.scheduler is not None:
+            self.scheduler.remove(self)
+            return
         self.task.cancel()
         try:
             await self.task
         except asyncio.CancelledError:
             pass
+
+    def apply_source_payload(self, payload, version=None):
+        """
+        Set values received from source unless they are the same as the last applied ones.
+        Source may pass source_version to the backend to fetch payload only if it changed,
+        and skip the call when the backend reports the payload is not modified.
+        :param payload: dict of property name to value
+        :param version: opaque version token of the payload like etag or revision,
+            hash of the payload content is used if None
+        :return: True if values were set, False if payload is not modified
+        :raises SettingsValidationError: if any value is invalid, no values are set then
+        """
+        if version is None:
+            version = _content_hash(payload)
+        if version is not None and version == self.source_version:
+            return False
+
+        self.apply_config(**payload)
+        self.source_version = version
+        return True
+
+    def subscribe(self, callback, *names):
+        """
+        Call callback when update from source changes watched properties.
+        Callback may be a function or a coroutine function, it takes frozenset of changed watched properties names.
+        Complex properties are changed when any of properties they are built from is changed.
+        Subscribing the same callback again replaces its watched properties.
+        :param callback: function called after update
+        :param names: names of watched properties, all properties are watched if no names given
+        :return: callback
+        :raises ValueError: if settings have no property with one of the names
+        """
+        for name in names:
+            if name not in self._properties:
+                raise ValueError(f'Settings have no property {name}')
+
+        if self._subscriptions is None:
+            self._subscriptions = {}
+        self._subscriptions[callback] = frozenset(names) if names else None
+        return callback
+
+    def unsubscribe(self, callback):
+        """Stop calling callback subscribed with subscribe"""
+        if self._subscriptions:
+            self._subscriptions.pop(callback, None)
+
+    async def refresh(self):
+        """
+        Update settings from source and call subscribers of changed properties.
+        Changes are found against values subscribers were last notified of, so values set
+        by an update which failed halfway are reported by the next successful refresh.
+        Exceptions of callbacks are logged and do not stop other callbacks.
+        :return: frozenset of changed properties names
+        """
+        if not self._subscriptions:
+            self._notified_values = None
+            await self.update_settings_from_source()
+            return frozenset()
+
+        previous = self._notified_values
+        if previous is None:
+            previous = self._read_values()
+        await self.update_settings_from_source()
+        current = self._read_values()
+        changed = self._changed_properties(previous, current)
+        self._notified_values = current
+        if changed:
+            await self._notify(changed)
+        return changed
+
+    def _read_values(self):
+        """Values of properties which are not built from other properties
+        :return: dict of property name to value
+        """
+        return {
+            name: getattr(self, name) for name, _property in self._properties.items()
+            if not isinstance(_property, ComplexProperty)
+        }
+
+    def _changed_properties(self, previous, current):
+        """Names of properties changed since values were read
+        :param previous: values returned by _read_values
+        :param current: values returned by _read_values after update
+        :return: frozenset of properties names including properties built from changed ones
+        """
+        changed = {name for name, value in current.items() if previous[name] != value}
+        if not changed:
+            return frozenset()
+
+        for name, _property in self._properties.items():
+            if name not in changed and isinstance(_property, ComplexProperty):
+                if not changed.isdisjoint(_dependencies(_property)):
+                    changed.add(name)
+        return frozenset(changed)
+
+    async def _notify(self, changed):
+        """Call subscribers of changed properties
+        :param changed: frozenset of changed properties names
+        """
+        # callbacks may unsubscribe while being notified
+        for callback, names in list(self._subscriptions.items()):
+            if names is not None:
+                names = names & changed
+                if not names:
+                    continue
+            else:
+                names = changed
+
+            try:
+                result = callback(names)
+                if asyncio.iscoroutine(result):
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f'An error have occured in callback {callback!r} of changed settings {sorted(names)}')
+
+
+def _content_hash(payload):
+    """Hash of payload content
+    :return: hex digest or None if payload can not be serialized
+    """
+    try:
+        content = json.dumps(payload, sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha1(content.encode()).hexdigest()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import os
+import sys
+from functools import partial
+
+from magic_settings.dynamic_settings_base import BaseDynamicSettings, DynamicSettingsSourceError
+from magic_settings.utils import _get_config_dict_from_dotenv, _get_config_dict_from_yaml
+
+logger = logging.getLogger(__name__)
+
+
+class FileDynamicSettings(BaseDynamicSettings):
+    """
+    Dynamic settings updated from yaml and .env files.
+    Files are checked with os.stat on each update and parsed only if they changed.
+    On Linux changes are also watched with inotify and applied right away.
+    Yaml values take precedence over .env values.
+    """
+
+    def __init__(self, loop, update_period, yaml_settings_path: str = None, dotenv_path: str = None,
+                 task_retries_number=3, scheduler=None, watch: bool = True, **kwargs):
+        """
+        :param yaml_settings_path: path to yaml file
+        :param dotenv_path: path to .env file
+        :param watch: apply changes as soon as inotify reports them if available
+        :param kwargs: other parameters of BaseSettings for init and ainit
+        """
+        if not yaml_settings_path and not dotenv_path:
+            raise ValueError('At least one of yaml_settings_path or dotenv_path should be specified')
+        super().__init__(loop, update_period, task_retries_number=task_retries_number, scheduler=scheduler,
+                         yaml_settings_path=yaml_settings_path, dotenv_path=dotenv_path, **kwargs)
+
+        self.watch = watch
+        # path -> (stat key, parsed dict)
+        self._files = {}
+        self._watcher = None
+        self._watch_task = None
+        self._events_pending = False
+
+    def _paths(self):
+        """Paths of files with their parsers in ascending priority"""
+        if self.dotenv_path:
+            yield self.dotenv_path, _get_config_dict_from_dotenv
+        if self.yaml_settings_path:
+            yield self.yaml_settings_path, partial(_get_config_dict_from_yaml, strict=True)
+
+    async def update_settings_from_source(self):
+        """
+        Parse changed files and set their values
+        :raises DynamicSettingsSourceError: if any of files is not available or can not be parsed,
+                previous values are kept then
+        """
+        changed = False
+        for path, load in self._paths():
+            try:
+                # stat follows symlinks, so a swapped symlink changes inode
+                stat = os.stat(path)
+            except OSError as e:
+                raise DynamicSettingsSourceError(f'Settings file {path} is not available: {e}')
+
+            stat_key = (stat.st_ino, stat.st_dev, stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get(path)
+            if cached is None or cached[0] != stat_key:
+                try:
+                    config = load(path)
+                except Exception as e:
+                    # file may be partially written, it is parsed again on the next update
+                    raise DynamicSettingsSourceError(f'Settings file {path} can not be parsed: {e}') from e
+                self._files[path] = (stat_key, config)
+                changed = True
+
+        if changed:
+            payload = {}
+            for path, _ in self._paths():
+                payload.update(self._files[path][1])
+            self.apply_source_payload(payload)
+
+    async def start_update(self):
+        """Start updating task and watching files"""
+        await super().start_update()
+        if self.watch and self._watcher is None:
+            self._watcher = _Inotify.create()
+            if self._watcher is not None:
+                for path, _ in self._paths():
+                    self._watcher.add_directories(path)
+                self.loop.add_reader(self._watcher.fd, self._on_files_event)
+
+    async def stop_update(self):
+        """Stop updating task and watching files"""
+        if self._watcher is not None:
+            self.loop.remove_reader(self._watcher.fd)
+            self._watcher.close()
+            self._watcher = None
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+        await super().stop_update()
+
+    def _on_files_event(self):
+        """Refresh settings on inotify events, events received while refreshing are handled by one more refresh"""
+        self._watcher.drain()
+        for path, _ in self._paths():
+            # symlink may point to a new directory now
+            self._watcher.add_directories(path)
+        self._events_pending = True
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = self.loop.create_task(self._refresh_on_events())
+
+    async def _refresh_on_events(self):
+        while self._events_pending:
+            self._events_pending = False
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception('An error have occured while updating settings from changed files')
+
+
+class _Inotify:
+    """Minimal inotify binding watching directories of settings files"""
+    # IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    MASK = 0x004 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+
+    def __init__(self, libc, get_errno, fd):
+        self._libc = libc
+        self._get_errno = get_errno
+        self.fd = fd
+        self._directories = set()
+
+    @classmethod
+    def create(cls):
+        """
+        :return: _Inotify instance or None if inotify is not available
+        """
+        if not sys.platform.startswith('linux'):
+            return None
+
+        import ctypes
+        import ctypes.util
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            logger.warning(f'inotify is not available: {os.strerror(ctypes.get_errno())}')
+            return None
+        return cls(libc, ctypes.get_errno, fd)
+
+    def add_directories(self, path: str):
+        """
+        Watch directories of the file and of its symlink target.
+        Atomic replacements like renames and symlink swaps of Kubernetes ConfigMap volumes are events of directories.
+        """
+        for directory in {os.path.dirname(os.path.abspath(path)), os.path.dirname(os.path.realpath(path))}:
+            if directory in self._directories:
+                continue
+            if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK) < 0:
+                logger.warning(f'Failed to watch {directory}: {os.strerror(self._get_errno())}')
+            else:
+                self._directories.add(directory)
+
+    def drain(self):
+        """Read all pending events, events are not parsed since files are compared by stat on update"""
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
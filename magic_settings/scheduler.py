@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshStats(NamedTuple):
+    """Refresh statistics of dynamic settings instance registered in RefreshScheduler"""
+    refreshes: int
+    failures: int
+    consecutive_failures: int
+    last_error: Optional[BaseException]
+    # loop time of the next refresh
+    next_refresh: float
+
+
+class _Entry:
+    """Schedule and statistics of registered dynamic settings instance"""
+    __slots__ = ('settings', 'period', 'key', 'refreshes', 'failures', 'consecutive_failures', 'last_error',
+                 'next_refresh')
+
+    def __init__(self, settings, period):
+        self.settings = settings
+        self.period = period
+        # key of the heap item which is currently valid for the entry
+        self.key = None
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.next_refresh = None
+
+
+class RefreshScheduler:
+    """
+    Refresh many dynamic settings instances from one task.
+    Instances are refreshed at jittered periods, so processes started at once do not poll the source at once.
+    After an error the delay of the instance grows exponentially up to max_backoff, and the instance
+    is refreshed again until it recovers.
+    """
+
+    def __init__(self, loop=None, jitter: float = 0.1, backoff_factor: float = 2, max_backoff: float = 300):
+        """
+        :param loop: event loop of the scheduler task, loop of the first added settings if None
+        :param jitter: max relative deviation of delay between refreshes
+        :param backoff_factor: multiplier of delay after each consecutive error
+        :param max_backoff: max delay after errors, in seconds
+        """
+        if not 0 <= jitter < 1:
+            raise ValueError('jitter should be in range [0, 1)')
+        if backoff_factor < 1:
+            raise ValueError('backoff_factor should not be less than 1')
+
+        self._loop = loop
+        self.loop = loop
+        self.jitter = jitter
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self._entries = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._task = None
+        self._wakeup = None
+        self._refreshing = set()
+
+    def add(self, settings, period: float = None):
+        """
+        Start refreshing settings. The first refresh happens at a random moment within the period.
+        :param settings: BaseDynamicSettings instance
+        :param period: time between refreshes in seconds, update_period of settings if None
+        """
+        if self._task is None or self.loop.is_closed():
+            # scheduler task exits when all settings are removed, settings of a closed loop are dropped
+            self._entries.clear()
+            self._heap.clear()
+            self.loop = self._loop or settings.loop
+            self._task = self.loop.create_task(self._run())
+        elif settings in self._entries:
+            return
+
+        entry = self._entries[settings] = _Entry(settings, settings.update_period if period is None else period)
+        self._schedule(entry, random.uniform(0, entry.period))
+
+    def remove(self, settings):
+        """Stop refreshing settings, a refresh in progress is not interrupted"""
+        self._entries.pop(settings, None)
+        self._wake()
+
+    def stats(self, settings) -> RefreshStats:
+        """
+        Refresh statistics of settings
+        :raises KeyError: if settings are not added
+        """
+        entry = self._entries[settings]
+        return RefreshStats(
+            refreshes=entry.refreshes, failures=entry.failures, consecutive_failures=entry.consecutive_failures,
+            last_error=entry.last_error, next_refresh=entry.next_refresh,
+        )
+
+    async def stop(self):
+        """Stop refreshing all settings and cancel refreshes in progress"""
+        self._entries.clear()
+        tasks = list(self._refreshing)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _delay(self, entry) -> float:
+        """Time until the next refresh of the entry, with backoff after errors and jitter"""
+        delay = entry.period
+        if entry.consecutive_failures:
+            limit = max(self.max_backoff, delay)
+            try:
+                # float power is computed at once, it raises OverflowError instead of growing
+                delay = min(delay * float(self.backoff_factor) ** entry.consecutive_failures, limit)
+            except OverflowError:
+                delay = limit
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _schedule(self, entry, delay):
+        entry.next_refresh = self.loop.time() + delay
+        entry.key = next(self._counter)
+        heapq.heappush(self._heap, (entry.next_refresh, entry.key, entry))
+        self._wake()
+
+    def _wake(self):
+        """Wake the scheduler task to check the heap"""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _run(self):
+        """Refresh due settings until all settings are removed"""
+        try:
+            while self._entries or self._refreshing:
+                while self._heap:
+                    when, key, entry = self._heap[0]
+                    if entry.key != key or self._entries.get(entry.settings) is not entry:
+                        # removed or rescheduled
+                        heapq.heappop(self._heap)
+                        continue
+                    if when > self.loop.time():
+                        break
+                    heapq.heappop(self._heap)
+                    task = self.loop.create_task(self._refresh(entry))
+                    self._refreshing.add(task)
+                    task.add_done_callback(self._refresh_done)
+
+                self._wakeup = self.loop.create_future()
+                timeout = self._heap[0][0] - self.loop.time() if self._heap else None
+                await asyncio.wait([self._wakeup], timeout=timeout)
+        finally:
+            self._task = None
+            self._wakeup = None
+            self._heap.clear()
+
+    def _refresh_done(self, task):
+        self._refreshing.discard(task)
+        self._wake()
+
+    async def _refresh(self, entry):
+        """Refresh settings of the entry and schedule the next refresh"""
+        try:
+            await entry.settings.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            entry.failures += 1
+            entry.consecutive_failures += 1
+            entry.last_error = e
+            logger.exception(
+                f'An error have occured while updating settings from source. '
+                f'Consecutive errors: {entry.consecutive_failures}')
+        else:
+            entry.refreshes += 1
+            entry.consecutive_failures = 0
+
+        if self._entries.get(entry.settings) is entry:
+            try:
+                delay = self._delay(entry)
+            except Exception:
+                # entry is never dropped from schedule, it is refreshed again after its period
+                logger.exception(f'An error have occured while scheduling refresh of {entry.settings!r}')
+                delay = entry.period
+            self._schedule(entry, delay)
+
+
+_default_scheduler = None
+
+
+def get_scheduler() -> RefreshScheduler:
+    """Process-wide scheduler shared by dynamic settings created with scheduler=True"""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = RefreshScheduler()
+    return _default_scheduler
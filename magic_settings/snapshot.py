@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import functools
+import hashlib
+import os
+import struct
+import time
+import types
+
+from magic_settings.utils import ComplexProperty
+
+# magic, format version, sequence number, payload length, schema hash
+_HEADER = struct.Struct('<8sIQQ20s')
+# sequence number is written separately after the rest of the header
+_SEQUENCE = struct.Struct('<Q')
+_SEQUENCE_OFFSET = struct.calcsize('<8sI')
+_MAGIC = b'MSETSNAP'
+FORMAT_VERSION = 1
+
+
+class SnapshotError(Exception):
+    """Snapshot is unavailable or does not match settings class"""
+    pass
+
+
+def schema_hash(settings_class) -> bytes:
+    """
+    Hash of settings class properties declaration. Values stored for one declaration are not valid for another.
+    Types, choices, defaults and code of converts, validators and transforms are hashed.
+    :return: sha1 digest
+    """
+    parts = [f'{settings_class.__module__}.{settings_class.__qualname__}']
+    for name, _property in settings_class._properties.items():
+        types = _property.types if isinstance(_property.types, tuple) else (_property.types,)
+        functions = list(_property.converts) + list(_property.validators) + list(getattr(_property, 'transforms', []))
+        parts.append(':'.join([
+            name, type(_property).__qualname__,
+            ','.join(_identity(t) for t in types),
+            ','.join(_identity(f) for f in functions),
+            _stable_repr(_property.choices),
+            _stable_repr(_property.default),
+        ]))
+    return hashlib.sha1('\n'.join(parts).encode()).digest()
+
+
+def _identity(obj) -> str:
+    """Name of type or function stable between processes, with hash of function code"""
+    if isinstance(obj, functools.partial):
+        return f'{_identity(obj.func)}({_stable_repr(obj.args)}, {_stable_repr(sorted(obj.keywords.items()))})'
+    name = getattr(obj, '__qualname__', None) or type(obj).__qualname__
+    module = getattr(obj, '__module__', None) or type(obj).__module__
+    code = getattr(obj, '__code__', None)
+    if code is None:
+        return f'{module}.{name}'
+    # all lambdas have the same qualified name, they differ by code
+    return f'{module}.{name}:{_code_hash(code)}:{_stable_repr(getattr(obj, "__defaults__", None))}'
+
+
+def _code_hash(code) -> str:
+    """Hash of bytecode with constants and names used by it"""
+    consts = ','.join(
+        _code_hash(const) if isinstance(const, types.CodeType) else _stable_repr(const)
+        for const in code.co_consts
+    )
+    return hashlib.sha1(code.co_code + f'{code.co_names}{consts}'.encode()).hexdigest()
+
+
+def _stable_repr(value) -> str:
+    """repr of value which does not change between processes: sets are sorted, memory addresses are omitted"""
+    if isinstance(value, (set, frozenset)):
+        return f'{type(value).__qualname__}({sorted(_stable_repr(item) for item in value)})'
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__qualname__}({[_stable_repr(item) for item in value]})'
+    if isinstance(value, dict):
+        return f'{type(value).__qualname__}({[(_stable_repr(k), _stable_repr(v)) for k, v in value.items()]})'
+    if type(value).__repr__ is object.__repr__:
+        return _identity(type(value))
+    return repr(value)
+
+
+def dump_values(settings) -> bytes:
+    """
+    Serialize converted and validated values of settings properties
+    :return: pickled dict of property name to value
+    """
+    import pickle
+
+    # values overridden by temp_set_attributes in current context are not dumped
+    values = contextvars.Context().run(_stored_values, settings)
+    return pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_values(settings, payload: bytes):
+    """
+    Set values serialized by dump_values without converting and validating them again
+    :param settings: settings instance of the class values were dumped from
+    :param payload: bytes returned by dump_values
+    :raises SnapshotError: if payload can not be unpickled
+    """
+    import pickle
+
+    try:
+        values = pickle.loads(payload)
+    except Exception as e:
+        raise SnapshotError(f'Snapshot values can not be unpickled: {e}') from e
+    settings._store_values(values)
+    if settings._snapshot is not None:
+        settings._publish()
+
+
+def _stored_values(settings):
+    """Values of properties as stored on settings, before transforms"""
+    return {
+        name: _property._stored_value(settings) for name, _property in settings._properties.items()
+        if not isinstance(_property, ComplexProperty)
+    }
+
+
+def write_snapshot(settings, path: str):
+    """
+    Write values of settings to snapshot file, the file is replaced atomically
+    :param settings: initialized settings
+    :param path: path to snapshot file
+    """
+    payload = dump_values(settings)
+    # published sequence number, so the file can be attached as SharedSnapshot too
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, 2, len(payload), schema_hash(type(settings)))
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(header + payload)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_snapshot(path: str, settings_class) -> bytes:
+    """
+    Read values written by write_snapshot
+    :param path: path to snapshot file
+    :param settings_class: class of settings to load values to
+    :return: serialized values
+    :raises SnapshotError: if file is not available, is not a snapshot or is written for another settings declaration
+    """
+    try:
+        with open(path, 'rb') as file:
+            content = file.read()
+    except OSError as e:
+        raise SnapshotError(f'Snapshot {path} is not available: {e}')
+
+    try:
+        magic, version, _, length, schema = _HEADER.unpack_from(content, 0)
+    except struct.error:
+        raise SnapshotError(f'{path} is not a snapshot file')
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        raise SnapshotError(f'{path} is not a snapshot file of version {FORMAT_VERSION}')
+    if schema != schema_hash(settings_class):
+        raise SnapshotError(f'Snapshot {path} is written for another settings declaration')
+    if len(content) != _HEADER.size + length:
+        raise SnapshotError(f'Snapshot {path} is truncated')
+    return content[_HEADER.size:]
+
+
+class SharedSnapshot:
+    """
+    Settings values shared between processes through a memory mapped file, e.g. by pre-fork workers.
+    The master process resolves settings and publishes them, workers attach to the file and take values
+    without reading sources, converting and validating values. Readers do not lock the file:
+    a sequence number is made odd while publishing and readers retry if it changed during read.
+    Snapshot file is unpickled by workers, it should be writable only by the user running the master.
+
+    shared = SharedSnapshot.create('/dev/shm/my_settings', Settings)
+    shared.publish(settings)
+    # in worker
+    shared = SharedSnapshot.attach('/dev/shm/my_settings', Settings)
+    shared.update(settings)
+    """
+
+    def __init__(self, path: str, settings_class, mapping, writable: bool):
+        self.path = path
+        self.settings_class = settings_class
+        self.schema = schema_hash(settings_class)
+        self._mapping = mapping
+        self._writable = writable
+        self._sequence = None
+
+    @classmethod
+    def create(cls, path: str, settings_class, size: int = 1 << 20):
+        """
+        Create snapshot file for publishing values. Existing file is replaced, not truncated,
+        so workers attached to it keep reading the old file until they attach again.
+        :param path: path to snapshot file, a tmpfs path like /dev/shm avoids disk writes
+        :param settings_class: class of published settings
+        :param size: max size of serialized values in bytes
+        :return: writable SharedSnapshot
+        """
+        import mmap
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            fd = os.open(temp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.ftruncate(fd, _HEADER.size + size)
+                mapping = mmap.mmap(fd, _HEADER.size + size)
+            finally:
+                os.close(fd)
+            _HEADER.pack_into(mapping, 0, _MAGIC, FORMAT_VERSION, 0, 0, b'')
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return cls(path, settings_class, mapping, writable=True)
+
+    @classmethod
+    def attach(cls, path: str, settings_class):
+        """
+        Open snapshot file created by the master process for reading
+        :raises SnapshotError: if file is not available or is not a snapshot file
+        :return: read-only SharedSnapshot
+        """
+        import mmap
+
+        try:
+            with open(path, 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f'Snapshot {path} is not available: {e}')
+
+        try:
+            magic, version, _, _, _ = _HEADER.unpack_from(mapping, 0)
+        except struct.error:
+            mapping.close()
+            raise SnapshotError(f'{path} is not a snapshot file')
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            mapping.close()
+            raise SnapshotError(f'{path} is not a snapshot file of version {FORMAT_VERSION}')
+        return cls(path, settings_class, mapping, writable=False)
+
+    def publish(self, settings):
+        """
+        Publish current values of settings, workers see them on their next update
+        :raises ValueError: if serialized values do not fit into the file
+        """
+        if not self._writable:
+            raise SnapshotError(f'Snapshot {self.path} is attached read-only')
+
+        payload = dump_values(settings)
+        if _HEADER.size + len(payload) > len(self._mapping):
+            raise ValueError(f'Settings values take {len(payload)} bytes, snapshot file size is not enough')
+
+        _, _, sequence, _, _ = _HEADER.unpack_from(self._mapping, 0)
+        # odd sequence number tells readers that values are being written
+        _SEQUENCE.pack_into(self._mapping, _SEQUENCE_OFFSET, sequence + 1)
+        self._mapping[_HEADER.size:_HEADER.size + len(payload)] = payload
+        _HEADER.pack_into(self._mapping, 0, _MAGIC, FORMAT_VERSION, sequence + 1, len(payload), self.schema)
+        # even sequence number is written last, readers seeing it see length and schema of its values
+        _SEQUENCE.pack_into(self._mapping, _SEQUENCE_OFFSET, sequence + 2)
+
+    def read(self, timeout: float = 1):
+        """
+        Read published values
+        :param timeout: time to retry reading while values are being published, in seconds
+        :return: (sequence number, serialized values) or (0, None) if nothing was published yet
+        :raises SnapshotError: if published values are of another settings declaration or reading timed out
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            _, _, sequence, length, schema = _HEADER.unpack_from(self._mapping, 0)
+            if sequence % 2 == 0:
+                if sequence == 0:
+                    return 0, None
+                payload = self._mapping[_HEADER.size:_HEADER.size + length]
+                if _SEQUENCE.unpack_from(self._mapping, _SEQUENCE_OFFSET)[0] == sequence:
+                    if schema != self.schema:
+                        raise SnapshotError(f'Snapshot {self.path} is published for another settings declaration')
+                    return sequence, payload
+            if time.monotonic() > deadline:
+                raise SnapshotError(f'Timed out reading snapshot {self.path}')
+            time.sleep(0.001)
+
+    def update(self, settings) -> bool:
+        """
+        Set values published since the last update on settings. Attach once per settings instance,
+        since the last seen sequence number is kept by SharedSnapshot.
+        :return: True if new values were set
+        :raises SnapshotError: if values can not be read or unpickled
+        """
+        _, _, sequence, _, _ = _HEADER.unpack_from(self._mapping, 0)
+        if sequence == self._sequence:
+            return False
+
+        sequence, payload = self.read()
+        if payload is None:
+            return False
+        load_values(settings, payload)
+        self._sequence = sequence
+        return True
+
+    def close(self):
+        self._mapping.close()
@@ -1,18 +1,19 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import contextlib
+import contextvars
+import copy
+import hashlib
 import logging
 import os
+import threading
+import time
 import types
 import warnings
+from collections import ChainMap
+from functools import lru_cache, partial
 from json import dumps
-from typing import Any, Callable, Dict, List, Tuple, Type, Union
-
-from dotenv import load_dotenv
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple, Type, Union
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,46 @@ class Undefined:
 
 undefined = Undefined()
 
+# marker of missing cache entry
+_missing = object()
+
+# settings instance -> dict of property name to value overridden by temp_set_attributes in current context
+_overlays = contextvars.ContextVar('magic_settings_overlays', default=None)
+# number of temp_set_attributes blocks entered in all contexts, properties skip overlays lookup while it is 0
+_active_overlays = 0
+_active_overlays_lock = threading.Lock()
+# types of values which can be changed in place
+_MUTABLE_TYPES = (list, dict, set, bytearray)
+# serializes publishing of snapshots, so the snapshot published last is built from the latest values
+_publish_lock = threading.Lock()
+
+
+class InitStats(NamedTuple):
+    """Statistics of BaseSettings.init, times are in seconds"""
+    total: float
+    # source name -> time of loading config dict of source
+    sources: Dict[str, float]
+    # source name -> number of keys set from source
+    keys: Dict[str, int]
+    # property name -> time of value conversion, or of setting value for properties with own setter or cache
+    convert: Dict[str, float]
+    # property name -> time of value validation, measured only for properties with default setter and no cache
+    validate: Dict[str, float]
+
+
+class SettingsValidationError(ValueError):
+    """ Values failed conversion or validation, ``errors`` maps property name to error message """
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__('; '.join(errors.values()))
+        self.errors = errors
+
+
+class InitSummary(NamedTuple):
+    """Names of sources reloaded and properties changed by BaseSettings.init"""
+    sources: Tuple[str, ...]
+    properties: Tuple[str, ...]
+
 
 class BaseSettings:
     """
@@ -38,8 +79,57 @@ class BaseSettings:
     settings.post_validate()
     """
 
+    # name -> property registry, built for every subclass in ``__init_subclass__``
+    _properties = types.MappingProxyType({})
+    # property name -> names of cached transforms properties depending on it
+    _dependents = types.MappingProxyType({})
+    # names of properties with values transformed on each read
+    _uncached = frozenset()
+    # property name -> cached transformed value, replaced with a new dict on invalidation
+    _transforms_cache = None
+
+    # source name -> (fingerprint, config dict) of the last init
+    _source_cache = None
+    # config dict applied by the last init
+    _applied_config = None
+    # property name -> raw value to be set on first read, filled by lazy init
+    _lazy_values = None
+    # InitStats of the last init called with collect_stats
+    _init_stats = None
+    # FrozenSettings published by bulk updates once snapshot is called
+    _snapshot = None
+    # property name -> (value, frozen value, copy of list, dict or set value or None) of the last published snapshot
+    _frozen_values = None
+    # True while init sets values, snapshot is published once when all of them are set
+    _publish_suspended = False
+    # frozenset of serialized properties names or None for all -> (properties values, sources, json),
+    # dropped when any property is set
+    _serialized = None
+    # values of properties are stored in a list indexed by property slot instead of instance dict
+    _compact = False
+    # number of property slots of compact settings class
+    _slots_number = 0
+    # values of properties of compact settings indexed by property slot, created on first set
+    _slot_values = None
+
+    def __init_subclass__(cls, compact: bool = None, **kwargs):
+        """
+        :param compact: store values of properties in a list indexed by property slot instead of instance dict
+               and read unset properties from their defaults without storing them. Inherited by subclasses
+        :raises TypeError: if compact is False for subclass of compact settings
+        """
+        super().__init_subclass__(**kwargs)
+        if compact is False and cls._compact:
+            raise TypeError(f'{cls.__name__} can not disable compact storage of its base class')
+        cls._properties = _collect_properties(cls)
+        if compact or cls._compact:
+            cls._properties = _make_compact(cls)
+        cls._dependents = _collect_dependents(cls._properties)
+        cls._uncached = _collect_uncached(cls._properties)
+
     def __init__(self, modules=None, prefix=None, dotenv_path=None,
-                 override_env=False, yaml_settings_path=None, use_env=True):
+                 override_env=False, yaml_settings_path=None, use_env=True, declared_env_only=False,
+                 yaml_cache_dir=None, export_dotenv=True):
         """
         :param modules: list of modules with settings or None
         :param prefix: prefix for env variables
@@ -47,6 +137,11 @@ class BaseSettings:
         :param override_env: override environment variables if True
         :param yaml_settings_path: path to yaml settings
         :param use_env: True if use environment variables else False
+        :param declared_env_only: look up only environment variables named after properties if True,
+               otherwise take all environment variables with prefix
+        :param yaml_cache_dir: directory to cache dict parsed from yaml settings in
+        :param export_dotenv: export variables from .env file to os.environ if True,
+               otherwise merge them with environment variables in memory
         :raises ValueError: if modules type is not list or NoneType
                 or if item in modules type is not ModuleType
         """
@@ -60,41 +155,141 @@ class BaseSettings:
                 raise ValueError(f'{module} type is not ModuleType or NoneType')
 
         self.yaml_settings_path = yaml_settings_path
+        self.yaml_cache_dir = yaml_cache_dir
 
-        if self.yaml_settings_path and not yaml:
+        if self.yaml_settings_path and not _import_yaml():
             raise ValueError('To use yaml_settings_path you need install PyYaml library.'
                              'Use magic-settings[yaml] to install it.')
 
         self.dotenv_path = dotenv_path
         self.override_env = override_env
+        self.export_dotenv = export_dotenv
         self.prefix = prefix if isinstance(prefix, str) else ''
 
         self.use_env = use_env
+        self.declared_env_only = declared_env_only
+
+        if self._compact:
+            # compact settings read parameters equal to defaults from class
+            for name, default in _shared_parameters.items():
+                value = self.__dict__[name]
+                if type(value) is type(default) and value == default:
+                    del self.__dict__[name]
+
+    @property
+    def _env_names(self):
+        """Names of properties which can be set from environment or None to take all variables"""
+        if not self.declared_env_only:
+            return None
+        return [name for name, _property in self._properties.items() if not isinstance(_property, ComplexProperty)]
 
     @property
     def _use_yaml_settings(self):
         return isinstance(self.yaml_settings_path, str)
 
     def update_config(self, **kwargs):
-        for k, v in kwargs.items():
+        self._set_config(kwargs)
+        if self._snapshot is not None and not self._publish_suspended:
+            self._publish()
+        return self
+
+    def _set_config(self, config):
+        """Set values one by one. Init sets values by this method, so that it does not call
+        update_config overridden by subclasses, e.g. to write values to dynamic settings source
+        :param config: dict of attribute name to value
+        """
+        for k, v in config.items():
             setattr(self, k, v)
+
+    def apply_config(self, **kwargs):
+        """
+        Set all values or none of them. Values are converted and validated before any of them is set.
+        :raises SettingsValidationError: with errors of all invalid values
+        """
+        values = {}
+        errors = {}
+        for name, value in kwargs.items():
+            _property = self._properties.get(name)
+            if _property is None:
+                values[name] = value
+            elif isinstance(_property, ComplexProperty):
+                errors[name] = f'Direct setting of {name} property not allowed'
+            else:
+                try:
+                    values[name] = _property._clean(value)
+                except ValueError as e:
+                    errors[name] = str(e)
+
+        if errors:
+            raise SettingsValidationError(errors)
+        self._store_values(values)
+        if self._snapshot is not None and not self._publish_suspended:
+            self._publish()
         return self
 
+    def _store_values(self, values):
+        """Store converted and validated values
+        :param values: dict of attribute name to value
+        """
+        if self._compact:
+            self._store_slots(values)
+        else:
+            self.__dict__.update(values)
+        self._serialized = None
+        # values set explicitly replace values deferred by lazy init
+        if self._lazy_values:
+            for name in values:
+                self._lazy_values.pop(name, None)
+
+        dependents = set()
+        for name in values:
+            dependents.update(self._dependents.get(name, ()))
+        if dependents:
+            self._reset_transforms(dependents)
+
+    def _store_slots(self, values):
+        """Store values of compact settings, values of other attributes are set to instance dict
+        :param values: dict of attribute name to value
+        """
+        slot_values = self._slot_values
+        if slot_values is None:
+            slot_values = self._slot_values = [_missing] * self._slots_number
+        for name, value in values.items():
+            _property = self._properties.get(name)
+            if isinstance(_property, _SlotStorage):
+                slot_values[_property._slot] = value
+            else:
+                self.__dict__[name] = value
+
+    def _drop_value(self, name):
+        """Remove stored value of property, so that it is read from lazy values or default"""
+        if not self._compact:
+            self.__dict__.pop(name, None)
+        elif self._slot_values is not None:
+            self._slot_values[self._properties[name]._slot] = _missing
+
     @property
     def properties(self):
-        for name in dir(self.__class__):
-            _property = self.__class__.__dict__.get(name)
-            if issubclass(_property.__class__, BaseProperty):
-                yield _property
+        return self._properties.values()
 
     def pre_validate(self):
+        cls = self.__class__
+        # properties are checked once per class
+        if cls.__dict__.get('_pre_validated'):
+            return
+
         for _property in self.properties:
             self._validate_types(_property)
             self._validate_choices(_property)
             self._validate_default(_property)
+        cls._pre_validated = True
 
     def post_validate(self):
+        deferred = self._lazy_values
         for _property in self.properties:
+            if deferred and (_property.name in deferred or isinstance(_property, ComplexProperty)):
+                # do not resolve values deferred by lazy init
+                continue
             value = getattr(self, _property.name)
             if isinstance(value, Undefined):
                 raise ValueError(f'Undefined value of required {_property.name} property, '
@@ -135,25 +330,477 @@ class BaseSettings:
                 raise ValueError(f'Default value of {_property.name} property '
                                  f'fall validation on {validator.__name__}')
 
-    def init(self):
-        """Initialize settings"""
+    def init(self, freeze=False, incremental=False, lazy=False, collect_stats=False):
+        """Initialize settings
+        :param freeze: return read-only snapshot of initialized settings if True
+        :param incremental: reload only changed sources and apply only changed values if True
+        :param lazy: convert and validate values of properties on first read instead of init if True
+        :param collect_stats: measure loading of sources and conversion of values, see last_init_stats
+        :return: FrozenSettings snapshot if freeze is True else InitSummary of reloaded sources and changed properties
+        """
+        started = time.perf_counter()
+        stats = InitStats(total=0.0, sources={}, keys={}, convert={}, validate={}) if collect_stats else None
         self.pre_validate()
 
+        files = {name: load() for name, load in self._file_loaders(incremental, stats).items()}
+        return self._complete_init(files, freeze, incremental, lazy, stats, started)
+
+    async def ainit(self, freeze=False, incremental=False, lazy=False, collect_stats=False, executor=None):
+        """Initialize settings without blocking event loop: .env and yaml files are read and parsed
+        concurrently in executor, then values of all sources are set in the same order as by init
+        :param executor: concurrent.futures.Executor to load files in, default executor of the loop if None
+        :return: the same as init
+        """
+        started = time.perf_counter()
+        stats = InitStats(total=0.0, sources={}, keys={}, convert={}, validate={}) if collect_stats else None
+        self.pre_validate()
+
+        loaders = self._file_loaders(incremental, stats)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[loop.run_in_executor(executor, load) for load in loaders.values()])
+        files = dict(zip(loaders, results))
+        return self._complete_init(files, freeze, incremental, lazy, stats, started)
+
+    def _complete_init(self, files, freeze, incremental, lazy, stats, started):
+        """Load other sources, set values of all sources and validate them
+        :param files: dict of file source name to result of its loader
+        """
+        reloaded = []
+        self._publish_suspended = True
+        try:
+            configs = self._load_sources(files, incremental, reloaded, stats)
+            changed = self._apply_configs(configs, incremental, lazy, stats)
+        finally:
+            self.__dict__.pop('_publish_suspended', None)
+
+        self.post_validate()
+        if self._snapshot is not None:
+            self._publish()
+
+        if stats is not None:
+            self._init_stats = stats._replace(total=time.perf_counter() - started)
+        if freeze:
+            return self.freeze()
+        return InitSummary(
+            sources=tuple(reloaded), properties=tuple(name for name in changed if name in self._properties),
+        )
+
+    def last_init_stats(self):
+        """
+        Statistics of the last init called with collect_stats=True
+        :return: InitStats or None if stats were not collected
+        """
+        return self._init_stats
+
+    def _file_loaders(self, incremental, stats=None):
+        """Functions loading .env and yaml files, they do not depend on each other and may run in other threads.
+        Loaders only read the sources cache, config dicts are cached by _load_sources in the thread of init.
+        :param incremental: take config dicts of unchanged files from cache if True
+        :param stats: InitStats to add loading time of sources to or None
+        :return: dict of source name to function returning (config dict, entry to cache or None)
+        """
+        if self._source_cache is None:
+            self._source_cache = {}
+        loaders = {}
+        if self.use_env and self.dotenv_path:
+            loaders['dotenv'] = partial(self._load_dotenv, incremental, stats)
+        if self._use_yaml_settings:
+            loaders['yaml'] = partial(self._load_yaml, incremental, stats)
+        return loaders
+
+    def _load_dotenv(self, incremental, stats=None):
+        """
+        :return: dict of variables or None if they are exported to os.environ, entry to cache or None
+        """
+        if self.export_dotenv:
+            from dotenv import load_dotenv
+
+            with _timed(stats, 'dotenv'):
+                _, entry = self._read_source(
+                    'dotenv', _file_fingerprint(self.dotenv_path),
+                    partial(load_dotenv, dotenv_path=self.dotenv_path, override=self.override_env), incremental,
+                )
+            return None, entry
+
+        with _timed(stats, 'dotenv'):
+            return self._read_source(
+                'dotenv', _file_fingerprint(self.dotenv_path),
+                partial(_get_config_dict_from_dotenv, self.dotenv_path), incremental,
+            )
+
+    def _load_yaml(self, incremental, stats=None):
+        """
+        :return: dict parsed from yaml file, entry to cache or None
+        """
+        with _timed(stats, 'yaml'):
+            return self._read_source(
+                'yaml', _file_fingerprint(self.yaml_settings_path),
+                partial(_get_config_dict_from_yaml, self.yaml_settings_path, cache_dir=self.yaml_cache_dir),
+                incremental,
+            )
+
+    def _load_sources(self, files, incremental, reloaded, stats=None):
+        """Load config dicts of modules and environment and merge them with config dicts of files
+        :param files: dict of file source name to result of its loader
+        :param incremental: take config dicts of unchanged sources from cache if True
+        :param reloaded: list of reloaded sources names to append to
+        :param stats: InitStats to add loading time of sources to or None
+        :return: list of (source name, config dict) in priority order
+        """
+        configs = []
+
         for module in self.modules:
-            self.update_config(**_get_config_dict_from_module(module))
+            if module is not None:
+                name = f'module:{module.__name__}'
+                with _timed(stats, name):
+                    configs.append((name, self._load_source(
+                        name, (id(module), getattr(module, '__version__', None)),
+                        partial(_get_config_dict_from_module, module), incremental, reloaded,
+                    )))
 
         if self.use_env:
-            if self.dotenv_path:
-                load_dotenv(dotenv_path=self.dotenv_path, override=self.override_env)
-            self.update_config(**_get_config_dict_from_env(prefix=self.prefix))
+            environ = None
+            if 'dotenv' in files:
+                dotenv_config, entry = files['dotenv']
+                self._cache_source('dotenv', entry, reloaded)
+                if dotenv_config is not None:
+                    # the first mapping takes precedence
+                    if self.override_env:
+                        environ = ChainMap(dotenv_config, os.environ)
+                    else:
+                        environ = ChainMap(os.environ, dotenv_config)
+
+            with _timed(stats, 'env'):
+                env_config = dict(_get_config_dict_from_env(prefix=self.prefix, environ=environ, names=self._env_names))
+                configs.append(('env', self._load_source('env', env_config, lambda: env_config, incremental, reloaded)))
+
+        if 'yaml' in files:
+            yaml_config, entry = files['yaml']
+            self._cache_source('yaml', entry, reloaded)
+            configs.append(('yaml', yaml_config))
+
+        return configs
+
+    def _apply_configs(self, configs, incremental, lazy, stats=None):
+        """Merge config dicts of sources and set merged values
+        :param configs: list of (source name, config dict) in priority order
+        :param incremental: set only values changed since the last init if True
+        :param lazy: defer conversion and validation of properties values to first read if True
+        :param stats: InitStats to add number of applied keys and conversion time to or None
+        :return: dict of set values
+        """
+        config = {}
+        for _, source_config in configs:
+            config.update(source_config)
+
+        if incremental and self._applied_config is not None:
+            applied = self._applied_config
+            changed = {
+                key: value for key, value in config.items() if key not in applied or applied[key] != value
+            }
+        else:
+            changed = config
+
+        if stats is not None:
+            origins = {}
+            for source_name, source_config in configs:
+                origins.update(dict.fromkeys(source_config, source_name))
+            for key in changed:
+                stats.keys[origins[key]] = stats.keys.get(origins[key], 0) + 1
+
+        # forget applied config until update succeeds, so values partially applied by failed init are reapplied
+        self._applied_config = None
+        if lazy:
+            self._defer_values(changed)
+        else:
+            if stats is not None:
+                self._update_config_timed(changed, stats)
+            else:
+                self._set_config(changed)
+        self._applied_config = config
+        return changed
+
+    def _update_config_timed(self, config, stats):
+        """Set values measuring conversion and validation time of each property. Values of properties
+        with overridden setter or remembered conversions are set by the setter and timed as a whole
+        :param config: dict of attribute name to value
+        :param stats: InitStats to add conversion and validation time to
+        """
+        for name, value in config.items():
+            _property = self._properties.get(name)
+            if _property is None or isinstance(_property, ComplexProperty):
+                setattr(self, name, value)
+                continue
+            if _property.cache_size or type(_property).__set__ not in _default_setters:
+                started = time.perf_counter()
+                setattr(self, name, value)
+                stats.convert[name] = time.perf_counter() - started
+                continue
+
+            convert, check = _property._clean_steps()
+            started = time.perf_counter()
+            value = convert(value)
+            converted = time.perf_counter()
+            value = check(value)
+            stats.convert[name] = converted - started
+            stats.validate[name] = time.perf_counter() - converted
+            self._store_values({name: value})
+
+    @classmethod
+    def from_snapshot(cls, path: str, **kwargs):
+        """
+        Create settings with values of snapshot file written by ``python -m magic_settings compile``.
+        Values are not read from sources, converted and validated again. If the snapshot is not available
+        or is written for another declaration of settings class, settings are initialized from sources.
+        :param path: path to snapshot file
+        :param kwargs: parameters of settings
+        :return: settings instance
+        """
+        from magic_settings.snapshot import SnapshotError, load_values, read_snapshot
+
+        settings = cls(**kwargs)
+        try:
+            payload = read_snapshot(path, cls)
+        except SnapshotError as e:
+            logger.warning(f'{e}, initializing settings from sources')
+            settings.init()
+        else:
+            load_values(settings, payload)
+        return settings
 
-        if self._use_yaml_settings:
-            self.update_config(**_get_config_dict_from_yaml(self.yaml_settings_path))
+    def _defer_values(self, config):
+        """Keep raw values of properties to be converted and validated on first read, set other values
+        :param config: dict of attribute name to raw value
+        """
+        deferred = {
+            name: value for name, value in config.items()
+            if name in self._properties and not isinstance(self._properties[name], ComplexProperty)
+        }
+        self._set_config({name: value for name, value in config.items() if name not in deferred})
+
+        if self._lazy_values is None:
+            self._lazy_values = {}
+        dependents = set()
+        for name, value in deferred.items():
+            self._drop_value(name)
+            self._lazy_values[name] = value
+            dependents.update(self._dependents.get(name, ()))
+        if dependents:
+            self._reset_transforms(dependents)
+        self._serialized = None
+
+    def validate_all(self):
+        """
+        Convert and validate all values deferred by lazy init
+        :raises SettingsValidationError: with errors of all invalid values
+        """
+        if self._lazy_values:
+            self.apply_config(**self._lazy_values)
+        self.post_validate()
+
+    def _load_source(self, name, fingerprint, load, incremental, reloaded):
+        """Load config dict from source or take it from cache if source fingerprint has not changed
+        :param name: source name
+        :param fingerprint: any comparable value which changes with source content
+        :param load: function returning config dict of source
+        :param incremental: use cached config dict if True
+        :param reloaded: list of reloaded sources names to append name to
+        :return: config dict of source
+        """
+        config, entry = self._read_source(name, fingerprint, load, incremental)
+        self._cache_source(name, entry, reloaded)
+        return config
+
+    def _read_source(self, name, fingerprint, load, incremental):
+        """Load config dict from source or take it from cache without changing the cache, may run in other threads
+        :return: config dict, (fingerprint, config dict) entry to cache or None if config dict is taken from cache
+        """
+        cached = self._source_cache.get(name)
+        if incremental and cached is not None and cached[0] == fingerprint:
+            return cached[1], None
+        config = load()
+        return config, (fingerprint, config)
+
+    def _cache_source(self, name, entry, reloaded):
+        """Cache config dict of reloaded source
+        :param entry: (fingerprint, config dict) returned by _read_source or None if source was not reloaded
+        :param reloaded: list of reloaded sources names to append name to
+        """
+        if entry is not None:
+            self._source_cache[name] = entry
+            reloaded.append(name)
 
+    def freeze(self):
+        """
+        Read-only snapshot of current settings values with plain attribute access.
+        Attributes reads of snapshot skip properties descriptors, writes raise AttributeError.
+        :return: FrozenSettings instance
+        :raises ValueError: if any required property is undefined
+        """
         self.post_validate()
+        return self._frozen_class().from_values({name: getattr(self, name) for name in self._properties})
 
-    def to_dict(self):
-        """ Dict representation """
+    def snapshot(self):
+        """
+        Consistent read-only view of settings values. The first call publishes a snapshot of current values,
+        after that each update_config, apply_config and init publishes a new snapshot replacing the reference
+        to the previous one, so readers never see values of an update partially applied.
+        Lists, dicts and sets are frozen to tuples, read-only mappings and frozensets,
+        frozen values of unchanged properties are shared between snapshots.
+        :return: FrozenSettings instance
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._publish()
+        return snapshot
+
+    def _publish(self):
+        """Build snapshot of current values and publish it
+        :return: published FrozenSettings instance
+        """
+        with _publish_lock:
+            # values overridden by temp_set_attributes in current context are not published
+            return contextvars.Context().run(self._publish_values)
+
+    def _publish_values(self):
+        previous = self._frozen_values or {}
+        frozen_values = {}
+        values = {}
+        deferred = self._deferred_properties()
+        for name in self._properties:
+            if name in deferred:
+                continue
+            value = getattr(self, name)
+            cached = previous.get(name)
+            if cached is not None and cached[0] is value and (cached[2] is None or _equal_values(value, cached[2])):
+                frozen_values[name] = cached
+            else:
+                # lists, dicts and sets can be changed in place, their frozen copies are reused while they are equal
+                frozen_values[name] = (
+                    value, _freeze_value(value), copy.deepcopy(value) if isinstance(value, _MUTABLE_TYPES) else None,
+                )
+            values[name] = frozen_values[name][1]
+
+        if deferred:
+            deferred = _DeferredValues(
+                deferred, dict(self._lazy_values), {name: value for name, (value, _, _) in frozen_values.items()},
+            )
+        snapshot = self._frozen_class().from_values(values, deferred or None)
+        self._frozen_values = frozen_values
+        # the only write readers can observe
+        self._snapshot = snapshot
+        return snapshot
+
+    def _deferred_properties(self):
+        """Properties with values deferred by lazy init and properties built from them
+        :return: dict of property name to property
+        """
+        deferred = self._lazy_values
+        if not deferred:
+            return {}
+        return {
+            name: _property for name, _property in self._properties.items()
+            if not deferred.keys().isdisjoint(_dependencies(_property))
+        }
+
+    @classmethod
+    def _frozen_class(cls):
+        """FrozenSettings subclass of settings class, created once"""
+        frozen_class = cls.__dict__.get('_frozen_settings_class')
+        if frozen_class is None:
+            frozen_class = cls._frozen_settings_class = FrozenSettings.make_class(cls)
+        return frozen_class
+
+    def to_dict(self, names: Iterable[str] = None):
+        """
+        Dict representation. Properties values are cached until any property is set.
+        :param names: names of properties to include, all properties are included if None
+        :raises ValueError: if settings have no property with one of the names
+        """
+        values, sources, _, _ = self._serialize(names)
+        return {
+            'properties': dict(values),
+            'sources': [dict(source, address=dict(source['address'])) for source in sources],
+        }
+
+    def to_json(self, names: Iterable[str] = None):
+        """
+        Json representation. Encoded json is cached until any property is set.
+        :param names: names of properties to include, all properties are included if None
+        :raises ValueError: if settings have no property with one of the names
+        """
+        entry = self._serialize(names)
+        if entry[2] is None:
+            entry[2] = dumps({'properties': entry[0], 'sources': entry[1]}, ensure_ascii=False)
+        return entry[2]
+
+    def _serialize(self, names):
+        """
+        Properties values and sources of dict representation. Sources are described on each call
+        since they are not properties, cached entry is used only if they did not change. Values which can change
+        without setting properties are read again and compared with their copies taken when entry was cached.
+        :return: list of properties values, sources, json or None if it was not encoded yet
+                 and dict of property name to copy of value which can change
+        """
+        if names is None:
+            key = None
+            names = self._properties
+        else:
+            key = names = frozenset(names)
+            for name in names:
+                if name not in self._properties:
+                    raise ValueError(f'Settings have no property {name}')
+
+        sources = self._describe_sources()
+        # values overridden in current context and values transformed on each read are not cached
+        cacheable = not (_active_overlays and self in (_overlays.get() or {}))
+        if self._uncached and not self._uncached.isdisjoint(names):
+            cacheable = False
+        if cacheable:
+            cache = self._serialized
+            if cache is None:
+                cache = self._serialized = {}
+            entry = cache.get(key)
+            if entry is not None and entry[1] == sources and self._values_unchanged(entry[3]):
+                return entry
+
+        values = {name: getattr(self, name) for name in self._properties if name in names}
+        entry = [values, sources, None, self._changeable_values(values) if cacheable else None]
+        # properties set while values were read drop the cache, entry with old values is not stored then
+        if cacheable and self._serialized is cache:
+            cache[key] = entry
+        return entry
+
+    def _changeable_values(self, values):
+        """Copies of values which can be changed in place: lists, dicts and sets set to properties
+        or returned by cached transforms, and values of complex properties built from them
+        :param values: dict of property name to value
+        :return: dict of property name to deep copy of value
+        """
+        changeable = {}
+        for name, value in values.items():
+            _property = self._properties[name]
+            if isinstance(_property, ComplexProperty):
+                # value is built on each read unless it is cached by transforms
+                if not (isinstance(_property, TransformsMixin) and isinstance(value, _MUTABLE_TYPES)) and not any(
+                    isinstance(getattr(self, member), _MUTABLE_TYPES) for member in _dependencies(_property)
+                    if not isinstance(self._properties[member], ComplexProperty)
+                ):
+                    continue
+            elif not isinstance(value, _MUTABLE_TYPES):
+                continue
+            changeable[name] = copy.deepcopy(value)
+        return changeable
+
+    def _values_unchanged(self, changeable):
+        """Check values which can change without setting properties are equal to their copies"""
+        for name, value in changeable.items():
+            if not _equal_values(getattr(self, name), value):
+                return False
+        return True
+
+    def _describe_sources(self):
+        """Sources of settings for dict representation"""
         sources = []
 
         for module in self.modules:
@@ -181,16 +828,7 @@ class BaseSettings:
                     'yaml_settings_path': self.yaml_settings_path,
                 }
             })
-
-        result_dict = {
-            'properties': {prop.name: getattr(self, prop.name) for prop in self.properties},
-            'sources': sources,
-        }
-        return result_dict
-
-    def to_json(self):
-        """ Json representation """
-        return dumps(self.to_dict(), ensure_ascii=False)
+        return sources
 
     def get_settings(self):
         """
@@ -201,30 +839,159 @@ class BaseSettings:
         self.init()
         return self
 
+    def _reset_transforms(self, names):
+        """Drop cached values of transforms properties
+        :param names: set of properties names
+        """
+        cache = self._transforms_cache
+        if cache is not None:
+            # new dict makes values computed concurrently from old values land in the dropped one
+            self._transforms_cache = {name: value for name, value in cache.items() if name not in names}
+
     @contextlib.contextmanager
     def temp_set_attributes(self, **kwargs):
         """
         Temporarily set an attributes on settings for the duration of the context manager.
-        Not Thread-safe
+        Properties values are overridden only for the current thread or asyncio task and tasks it creates,
+        other attributes are set on settings. Values are restored on exit, also when the block raises.
         :param kwargs: dict: key - attribute name, value - temporary value
         :raises AttributeError: if any key in kwargs doesn't fit to any attribute name in class
+        :raises ValueError: if any property value fails conversion or validation
         """
-        old_values = {}
+        values = {}
+        attributes = {}
         for attr, new_value in kwargs.items():
-            if hasattr(self, attr):
+            if not hasattr(self, attr):
+                raise AttributeError(f'{self.__class__} does`t have such attribute')
+
+            _property = self._properties.get(attr)
+            if _property is None:
+                attributes[attr] = new_value
+            elif isinstance(_property, ComplexProperty):
+                raise AttributeError(f'Direct setting of {attr} property not allowed')
+            else:
+                values[attr] = _property._clean(new_value)
+
+        global _active_overlays
+        overlays = dict(_overlays.get() or {})
+        # nested blocks override values of outer ones
+        overlays[self] = {**overlays.get(self, {}), **values}
+        token = _overlays.set(overlays)
+        with _active_overlays_lock:
+            _active_overlays += 1
+
+        old_values = {}
+        try:
+            for attr, new_value in attributes.items():
                 old_values[attr] = getattr(self, attr)
                 setattr(self, attr, new_value)
+            yield
+        finally:
+            for attr, old_value in old_values.items():
+                setattr(self, attr, old_value)
+            with _active_overlays_lock:
+                _active_overlays -= 1
+            _overlays.reset(token)
+
+
+class FrozenSettings:
+    """
+    Read-only snapshot of settings. Each settings class gets own subclass with a slot for every property.
+
+    settings = Settings()
+    frozen = settings.init(freeze=True)
+    frozen.FOO
+    """
+
+    __slots__ = ('_deferred',)
+
+    @classmethod
+    def make_class(cls, settings_class):
+        """Create snapshot class with slots for all properties of settings class"""
+        return type(f'Frozen{settings_class.__name__}', (cls,), {
+            '__slots__': tuple(settings_class._properties),
+            '__module__': settings_class.__module__,
+        })
+
+    @classmethod
+    def from_values(cls, values, deferred=None):
+        """Create snapshot from dict of properties values
+        :param deferred: _DeferredValues resolving properties missing in values on first read
+        """
+        frozen = object.__new__(cls)
+        for name, value in values.items():
+            object.__setattr__(frozen, name, value)
+        object.__setattr__(frozen, '_deferred', deferred)
+        return frozen
+
+    def __getattr__(self, name):
+        # called for empty slots only, values deferred by lazy init are converted on first read
+        deferred = object.__getattribute__(self, '_deferred')
+        if deferred is None or name not in deferred.properties:
+            raise AttributeError(f'{self.__class__.__name__} has no attribute {name}')
+        value = _freeze_value(deferred.resolve(name))
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is read-only, cannot set {name}')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is read-only, cannot delete {name}')
+
+    def _asdict(self):
+        """ Dict representation """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._asdict()!r})'
+
+
+class _DeferredValues:
+    """Values of snapshot properties which were deferred by lazy init when snapshot was published"""
+
+    def __init__(self, properties, raw_values, values):
+        """
+        :param properties: dict of name to property deferred by lazy init or built from deferred properties
+        :param raw_values: dict of property name to raw value deferred by lazy init
+        :param values: dict of property name to value of properties which were not deferred
+        """
+        self.properties = properties
+        self.raw_values = raw_values
+        self.values = values
+
+    def resolve(self, name):
+        """Value of property as settings would return it, without reading settings"""
+        value = self.values.get(name, _missing)
+        if value is _missing:
+            _property = self.properties[name]
+            if isinstance(_property, ComplexProperty):
+                if _property.keys:
+                    value = {key: self.resolve(member.name) for key, member in _property.keys.items()}
+                else:
+                    value = [self.resolve(member.name) for member in _property.sequence or []]
             else:
-                raise AttributeError(f'{self.__class__} does`t have such attribute')
-        yield
-        for attr, old_value in old_values.items():
-            setattr(self, attr, old_value)
+                value = _property._clean(self.raw_values[name])
+            if isinstance(_property, TransformsMixin):
+                value = _property._transform(value)
+            self.values[name] = value
+        return value
 
 
 class BaseProperty:
     def __init__(self, types: Union[Tuple[Type, ...], Type] = None, validators: List[Callable] = None,
-                 choices: List[Any] = None, default: Any = undefined, converts: List[Callable] = None):
-
+                 choices: List[Any] = None, default: Any = undefined, converts: List[Callable] = None,
+                 cache_size: int = None):
+        """
+        :param types: allowed types of value
+        :param validators: functions returning True for valid value
+        :param choices: allowed values
+        :param default: value of property which was not set
+        :param converts: functions successively applied to string value
+        :param cache_size: number of assigned values to remember converted values of, so that assigning them again
+               skips conversion and validation. Only values of scalar types are remembered
+        """
+        self.cache_size = cache_size
         self.types = types if types is not None else ()
         self.validators = validators if validators is not None else []
 
@@ -237,34 +1004,59 @@ class BaseProperty:
         if instance is None:
             return self
 
-        value = instance.__dict__.setdefault(self.name, self.default)
+        if _active_overlays:
+            overlay = (_overlays.get() or {}).get(instance)
+            if overlay is not None and self.name in overlay:
+                return overlay[self.name]
 
-        return value
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
 
-    def __set__(self, instance, value):
-        if isinstance(value, str):
-            for method in self.converts:
-                try:
-                    value = method(value)
-                except Exception as e:
-                    raise ValueError(f'Failed to convert property {self.name} with error: {e}')
+        deferred = instance._lazy_values
+        if deferred and self.name in deferred:
+            self.__set__(instance, deferred[self.name])
+            return instance.__dict__[self.name]
 
-        if self.choices:
-            if value not in self.choices:
-                raise ValueError(f"Value of {self.name} property should be equal to any of {', '.join(self.choices)}")
-        else:
-            if self.types and not isinstance(value, self.types):
-                raise ValueError(f'Value of {self.name} property should be any of {self.types} types')
+        return instance.__dict__.setdefault(self.name, self.default)
 
-            for validator in self.validators:
-                if not validator(value):
-                    # TODO: figure out lambda's source code extraction
-                    raise ValueError(f'Property {self.name} falls validation on {validator.__name__}')
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = self._clean(value)
+        if instance._serialized is not None:
+            instance._serialized = None
+        # value set explicitly replaces value deferred by lazy init
+        if instance._lazy_values:
+            instance._lazy_values.pop(self.name, None)
+
+        dependents = instance._dependents.get(self.name)
+        if dependents:
+            instance._reset_transforms(dependents)
 
-        instance.__dict__[self.name] = value
+    def _stored_value(self, instance):
+        """Value of property as stored on settings instance, before transforms"""
+        return BaseProperty.__get__(self, instance, type(instance))
 
     def __set_name__(self, owner, name):
         self.name = name
+        self._compile()
+
+    def _compile(self):
+        """Build ``_clean`` function converting and validating values assigned to property"""
+        clean = _make_clean(self.name, self.types, self.choices, self.validators, self.converts)
+        if self.cache_size:
+            clean = _memoize_clean(clean, self.cache_size)
+        self._clean = clean
+
+    def _clean_steps(self):
+        """Separate conversion and validation functions doing the same as ``_clean``, built on first use"""
+        steps = self.__dict__.get('_steps')
+        if steps is None:
+            steps = self._steps = (
+                _make_clean(self.name, (), [], [], self.converts),
+                _make_clean(self.name, self.types, self.choices, self.validators, []),
+            )
+        return steps
 
     def __repr__(self):
         return f"Property('{self.name}')"
@@ -294,12 +1086,33 @@ class ComplexProperty(BaseProperty):
 
 
 class TransformsMixin:
-    def __init__(self, transforms: List[Callable] = None, **kwargs):
+    def __init__(self, transforms: List[Callable] = None, cached: bool = True, **kwargs):
+        """
+        :param transforms: functions successively applied to value on read
+        :param cached: cache transformed value per settings instance until property or its members are set
+        """
         super().__init__(**kwargs)
         self.transforms = transforms if transforms is not None else []
+        self.cached = cached
 
     def __get__(self, instance, owner):
-        value = super().__get__(instance, owner)
+        if instance is None:
+            return self
+
+        # values overridden in current context are not cached
+        if not self.cached or (_active_overlays and instance in (_overlays.get() or {})):
+            return self._transform(super().__get__(instance, owner))
+
+        cache = instance._transforms_cache
+        if cache is None:
+            cache = instance._transforms_cache = {}
+
+        value = cache.get(self.name, _missing)
+        if value is _missing:
+            value = cache[self.name] = self._transform(super().__get__(instance, owner))
+        return value
+
+    def _transform(self, value):
         for transform in self.transforms:
             if isinstance(value, List):
                 value = transform(*value)
@@ -309,6 +1122,10 @@ class TransformsMixin:
                 value = transform(value)
         return value
 
+    def _dependencies(self):
+        """Names of the property and of all properties its value is built from"""
+        return _dependencies(self)
+
 
 class Property(BaseProperty):
     pass
@@ -322,19 +1139,358 @@ class TransformsComplexProperty(TransformsMixin, ComplexProperty):
     pass
 
 
+class _SlotStorage(BaseProperty):
+    """
+    Storage of property values of compact settings. Values are kept in a list of settings instance
+    at the slot index of property, unset properties return default without storing it.
+    Compact settings classes get copies of their properties with this class mixed in under property class,
+    so that transforms and other overrides of property class are applied to stored value.
+    """
+    _slot = None
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        if _active_overlays:
+            overlay = (_overlays.get() or {}).get(instance)
+            if overlay is not None and self.name in overlay:
+                return overlay[self.name]
+
+        slot_values = instance._slot_values
+        if slot_values is not None:
+            value = slot_values[self._slot]
+            if value is not _missing:
+                return value
+
+        deferred = instance._lazy_values
+        if deferred and self.name in deferred:
+            self.__set__(instance, deferred[self.name])
+            return instance._slot_values[self._slot]
+
+        return self.default
+
+    def __set__(self, instance, value):
+        value = self._clean(value)
+        slot_values = instance._slot_values
+        if slot_values is None:
+            slot_values = instance._slot_values = [_missing] * instance._slots_number
+        slot_values[self._slot] = value
+        if instance._serialized is not None:
+            instance._serialized = None
+        if instance._lazy_values:
+            instance._lazy_values.pop(self.name, None)
+
+        dependents = instance._dependents.get(self.name)
+        if dependents:
+            instance._reset_transforms(dependents)
+
+    def _stored_value(self, instance):
+        return _SlotStorage.__get__(self, instance, type(instance))
+
+
+# setters storing value cleaned by _clean, equal to storing result of _clean_steps by _store_values
+_default_setters = (BaseProperty.__set__, _SlotStorage.__set__)
+
+# property class -> its subclass storing values in slots
+_slot_classes = {}
+
+# parameters of BaseSettings.__init__ with their default values, compact settings share them through class
+_shared_parameters = types.MappingProxyType({
+    'modules': [],
+    'yaml_settings_path': None,
+    'yaml_cache_dir': None,
+    'dotenv_path': None,
+    'override_env': False,
+    'export_dotenv': True,
+    'prefix': '',
+    'use_env': True,
+    'declared_env_only': False,
+})
+
+
+def _slot_class(property_class):
+    """Subclass of property class storing values in slots of compact settings"""
+    if issubclass(property_class, _SlotStorage):
+        return property_class
+    if property_class is BaseProperty:
+        return _SlotStorage
+
+    slot_class = _slot_classes.get(property_class)
+    if slot_class is None:
+        slot_class = _slot_classes[property_class] = type(
+            f'Compact{property_class.__name__}', (property_class, _SlotStorage),
+            {'__module__': property_class.__module__, '__qualname__': f'Compact{property_class.__qualname__}'},
+        )
+    return slot_class
+
+
+def _make_compact(cls):
+    """Set copies of properties storing values in slots on compact settings class
+    and defaults of BaseSettings parameters shared by its instances
+    :param cls: settings class
+    :return: read-only mapping of property name to property sorted by name
+    """
+    properties = {}
+    slot = 0
+    for name, _property in cls._properties.items():
+        if not isinstance(_property, ComplexProperty):
+            _property = copy.copy(_property)
+            _property.__class__ = _slot_class(type(_property))
+            _property._slot = slot
+            slot += 1
+            setattr(cls, name, _property)
+        properties[name] = _property
+
+    cls._compact = True
+    cls._slots_number = slot
+    for name, default in _shared_parameters.items():
+        if name not in cls._properties:
+            setattr(cls, name, _freeze_value(default))
+    return types.MappingProxyType(properties)
+
+
+def _collect_properties(cls):
+    """Collect properties of settings class following its MRO
+    :param cls: settings class
+    :return: read-only mapping of property name to property sorted by name, as ``dir`` used to list them
+    """
+    properties = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, BaseProperty):
+                properties[name] = value
+            elif name in properties:
+                del properties[name]
+    return types.MappingProxyType(dict(sorted(properties.items())))
+
+
+# path -> (stat key, content digest) cache of _file_fingerprint
+_file_digests = {}
+
+
+def _file_fingerprint(path: str):
+    """Fingerprint of file content. Content is hashed again only if file mtime, size or inode changed
+    :param path: path to file
+    :return: content digest or None if file is not available
+    """
+    try:
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = _file_digests.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        with open(path, 'rb') as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+    except OSError:
+        return None
+    _file_digests[path] = (stat_key, digest)
+    return digest
+
+
+@contextlib.contextmanager
+def _timed(stats, name: str):
+    """Add wall time of the block to loading time of source in stats
+    :param stats: InitStats or None to not measure time
+    :param name: source name
+    """
+    if stats is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.sources[name] = stats.sources.get(name, 0.0) + time.perf_counter() - started
+
+
+def _make_clean(name: str, types: Union[Tuple[Type, ...], Type], choices: List[Any],
+                validators: List[Callable], converts: List[Callable]):
+    """
+    Build function converting and validating value assigned to property.
+    Converts are applied only to string value. Value is checked against choices if any,
+    otherwise against types and validators.
+    Source of the function is generated to skip loops and checks that property does not need.
+    :return: function taking assigned value and returning converted value
+    :raises ValueError: from built function if value fails conversion or validation
+    """
+    namespace = {'name': name, 'types': types}
+    lines = ['def clean(value):']
+
+    if converts:
+        lines += ['    if isinstance(value, str):', '        try:']
+        for index, method in enumerate(converts):
+            namespace[f'convert_{index}'] = method
+            lines.append(f'            value = convert_{index}(value)')
+        lines += ['        except Exception as e:',
+                  "            raise ValueError(f'Failed to convert property {name} with error: {e}')"]
+
+    if choices:
+        choices = list(choices)
+        try:
+            namespace['choices_set'] = frozenset(choices)
+        except TypeError:
+            namespace['choices_set'] = choices
+        namespace['choices'] = choices
+        namespace['choices_message'] = \
+            f"Value of {name} property should be equal to any of {', '.join(map(str, choices))}"
+        lines += ['    try:',
+                  '        found = value in choices_set',
+                  '    except TypeError:',
+                  '        # unhashable value',
+                  '        found = value in choices',
+                  '    if not found:',
+                  '        raise ValueError(choices_message)']
+    else:
+        if types:
+            lines += ['    if not isinstance(value, types):',
+                      "        raise ValueError(f'Value of {name} property should be any of {types} types')"]
+        for index, validator in enumerate(validators):
+            namespace[f'validator_{index}'] = validator
+            # TODO: figure out lambda's source code extraction
+            lines += [f'    if not validator_{index}(value):',
+                      f'        validator = validator_{index}',
+                      "        raise ValueError(f'Property {name} falls validation on {validator.__name__}')"]
+
+    lines.append('    return value')
+    exec('\n'.join(lines), namespace)
+    return namespace['clean']
+
+
+# types of assigned values remembered by memoized clean functions, values of other types may be unhashable
+# or equal to values of different content
+_memoized_types = frozenset((str, bytes, int, float, bool, NoneType))
+
+
+def _memoize_clean(clean: Callable, size: int):
+    """
+    Remember results of clean function for the last assigned values. Invalid values are not remembered.
+    :param clean: function built by _make_clean
+    :param size: max number of remembered values
+    :return: function with cache_info and cache_clear methods of lru_cache
+    """
+    cached = lru_cache(maxsize=size, typed=True)(clean)
+
+    def memoized(value):
+        if type(value) not in _memoized_types:
+            return clean(value)
+        result = cached(value)
+        if type(result) not in _memoized_types:
+            # remembered result is shared between assignments, each gets own copy of it and of nested containers
+            return copy.deepcopy(result)
+        return result
+
+    memoized.cache_info = cached.cache_info
+    memoized.cache_clear = cached.cache_clear
+    return memoized
+
+
+def _dependencies(_property):
+    """Names of the property and of all properties its value is built from
+    :param _property: property of settings class
+    :return: set of properties names
+    """
+    names = set()
+    properties = [_property]
+    while properties:
+        _property = properties.pop()
+        names.add(_property.name)
+        if isinstance(_property, ComplexProperty):
+            properties.extend((_property.keys or {}).values())
+            properties.extend(_property.sequence or [])
+    return names
+
+
+def _equal_values(value, other):
+    """Check values are equal and of the same type, so that 1 and True or 1 and 1.0 differ"""
+    return type(value) is type(other) and value == other
+
+
+def _freeze_value(value):
+    """Immutable copy of lists, dicts and sets, other values are returned as is"""
+    # tuple subclasses like named tuples are kept
+    if isinstance(value, list) or type(value) is tuple:
+        return tuple(_freeze_value(item) for item in value)
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _freeze_value(item) for key, item in value.items()})
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def _collect_dependents(properties):
+    """Map properties names to names of cached transforms properties which depend on them
+    :param properties: properties registry of settings class
+    :return: read-only mapping of property name to frozenset of dependent properties names
+    """
+    dependents = {}
+    for name, _property in properties.items():
+        if isinstance(_property, TransformsMixin) and _property.cached:
+            for dependency in _property._dependencies():
+                dependents.setdefault(dependency, set()).add(name)
+    return types.MappingProxyType({name: frozenset(names) for name, names in dependents.items()})
+
+
+def _collect_uncached(properties):
+    """Names of properties with values transformed on each read: not cached transforms properties
+    and properties built from them
+    :param properties: properties registry of settings class
+    :return: frozenset of properties names
+    """
+    uncached = {
+        name for name, _property in properties.items()
+        if isinstance(_property, TransformsMixin) and not _property.cached
+    }
+    return frozenset(
+        name for name, _property in properties.items() if not uncached.isdisjoint(_dependencies(_property))
+    )
+
+
 def _get_config_dict_from_module(module):
     return {var: getattr(module, var) for var in filter(str.isupper, dir(module))}
 
 
-def _get_config_dict_from_env(prefix: str = '', environ: Dict = None):
+# path -> (fingerprint, variables) cache of _get_config_dict_from_dotenv
+_dotenv_cache = {}
+
+
+def _get_config_dict_from_dotenv(path: str):
+    """Parse .env file without exporting variables to environment
+    :param path: path to .env file
+    :return: dict of variables, parsed again only if file content changed
+    """
+    fingerprint = _file_fingerprint(path)
+    cached = _dotenv_cache.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    from dotenv import dotenv_values
+
+    # variables declared without value are parsed as None
+    result = {key: value for key, value in dotenv_values(path).items() if value is not None}
+    _dotenv_cache[path] = (fingerprint, result)
+    return result
+
+
+def _get_config_dict_from_env(prefix: str = '', environ: Dict = None, names: Iterable[str] = None):
     """Creates dictionary using environment variables with prefix
     :param prefix: prefix variable searching by
     :param environ: dictionary, by default os.environ
+    :param names: names of variables without prefix to look up, all variables with prefix are taken if None
     :return: dictionary with environment variable without prefix
     """
     prefix = f'{prefix}_' if prefix and not prefix.endswith('_') else prefix
 
     environ = os.environ if environ is None else environ
+    if names is not None:
+        result = {}
+        for name in names:
+            key = prefix + name
+            if key in environ:
+                result[name] = environ[key]
+        return result
+
     if not prefix:
         return environ
 
@@ -346,6 +1502,17 @@ def _get_config_dict_from_env(prefix: str = '', environ: Dict = None):
     return result
 
 
+def _import_yaml():
+    """Import PyYaml on first use, it is an optional dependency and takes time to import
+    :return: yaml module or None if PyYaml is not installed
+    """
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return yaml
+
+
 def _validate_yaml_dict(yaml_dict):
     """Validate dict parsed from yaml configuration file
     :param yaml_dict: dict parsed from yaml configuration file
@@ -358,16 +1525,68 @@ def _validate_yaml_dict(yaml_dict):
             raise TypeError(f'configuration file has several levels of nesting.')
 
 
-def _get_config_dict_from_yaml(path: str):
+def _get_config_dict_from_yaml(path: str, cache_dir: str = None, strict: bool = False):
     """Get and validate dict from yaml file
     :param path: path to yaml configuration file
+    :param cache_dir: directory to cache parsed dict in, file is not parsed again while its content is unchanged
+    :param strict: raise exception if file can not be read or is not a valid settings file
     :return: dict parsed from yaml configuration file or empty dict if exception
     """
     try:
-        with open(path) as file:
-            result = yaml.load(file, Loader=yaml.SafeLoader) or {}
-            _validate_yaml_dict(result)
+        with open(path, 'rb') as file:
+            content = file.read()
+            stat = os.fstat(file.fileno())
+
+        if cache_dir:
+            cache_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, hashlib.sha1(content).hexdigest())
+            cache_path = os.path.join(cache_dir, f'{hashlib.sha1(cache_key[0].encode()).hexdigest()}.pickle')
+            result = _read_yaml_cache(cache_path, cache_key)
+            if result is not None:
+                return result
+
+        # libyaml based loader is much faster if PyYaml is built with it
+        yaml = _import_yaml()
+        result = yaml.load(content, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+        _validate_yaml_dict(result)
+
+        if cache_dir:
+            _write_yaml_cache(cache_path, cache_key, result)
     except (IOError, TypeError, ValueError) as e:
+        if strict:
+            raise
         logger.error(f'Cannot read YAML config: {e}')
         result = {}
     return result
+
+
+def _read_yaml_cache(cache_path: str, cache_key: Tuple):
+    """Read dict cached by _write_yaml_cache
+    :return: cached dict or None if there is no cache for the key
+    """
+    import pickle
+
+    try:
+        with open(cache_path, 'rb') as file:
+            key, result = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f'Cannot read YAML config cache {cache_path}: {e}')
+        return None
+    return result if key == cache_key else None
+
+
+def _write_yaml_cache(cache_path: str, cache_key: Tuple, result: Dict):
+    """Write dict parsed from yaml to cache file, temporary file is replaced to not leave partially written cache"""
+    import pickle
+
+    temp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'wb') as file:
+            pickle.dump((cache_key, result), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        logger.warning(f'Cannot write YAML config cache {cache_path}: {e}')
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
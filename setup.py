@@ -30,7 +30,7 @@ setup(
     long_description=read('README.md'),
     long_description_content_type='text/markdown',
     license='MIT',
-    python_requires='~=3.6',
+    python_requires='~=3.7',
     zip_safe=True,
     install_requires=[
         'python-dotenv~=0.10.2',
@@ -46,7 +46,6 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Topic :: Software Development :: Libraries :: Python Modules',
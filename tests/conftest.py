@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+import types
+
+import pytest
+
+
+@pytest.fixture
+def module():
+    """Settings module source setting HOST and PORT"""
+    module = types.ModuleType('settings_module')
+    module.HOST = 'module-host'
+    module.PORT = 1
+    return module
+
+
+@pytest.fixture
+def yaml_path(tmp_path):
+    """Yaml source overriding PORT of module"""
+    path = tmp_path / 'settings.yaml'
+    path.write_text('PORT: 2\n')
+    return str(path)
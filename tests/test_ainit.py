@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseDynamicSettings, BaseSettings, FrozenSettings, InitSummary, IntProperty, StringProperty
+from magic_settings import utils
+
+
+class Settings(BaseSettings):
+    HOST = StringProperty()
+    PORT = IntProperty()
+    NAME = StringProperty(default='name')
+    LEVEL = StringProperty(default='info')
+
+
+class DynSettings(BaseDynamicSettings):
+    HOST = StringProperty()
+    PORT = IntProperty()
+
+    async def update_settings_from_source(self):
+        pass
+
+
+@pytest.fixture
+def dotenv_path(tmp_path):
+    path = tmp_path / '.env'
+    path.write_text('AINIT_NAME=dotenv-name\nAINIT_LEVEL=dotenv-level\n')
+    return str(path)
+
+
+@pytest.fixture
+def settings(module, yaml_path, dotenv_path):
+    return Settings(modules=[module], prefix='AINIT', dotenv_path=dotenv_path, yaml_settings_path=yaml_path,
+                    export_dotenv=False)
+
+
+@pytest.mark.asyncio
+async def test_ainit(settings):
+    summary = await settings.ainit()
+
+    assert summary.sources == ('module:settings_module', 'dotenv', 'env', 'yaml')
+    assert set(summary.properties) == {'HOST', 'LEVEL', 'NAME', 'PORT'}
+    assert settings.HOST == 'module-host'
+    assert settings.PORT == 2
+    assert settings.NAME == 'dotenv-name'
+    assert settings.LEVEL == 'dotenv-level'
+
+
+@pytest.mark.asyncio
+async def test_ainit_same_as_init(settings, module, yaml_path, dotenv_path, monkeypatch):
+    monkeypatch.setenv('AINIT_LEVEL', 'env-level')
+    await settings.ainit()
+    other = Settings(modules=[module], prefix='AINIT', dotenv_path=dotenv_path, yaml_settings_path=yaml_path,
+                     export_dotenv=False)
+    other.init()
+    assert settings.to_dict()['properties'] == other.to_dict()['properties']
+
+
+@pytest.mark.asyncio
+async def test_ainit_exported_dotenv(module, dotenv_path, monkeypatch):
+    monkeypatch.delenv('AINIT_NAME', raising=False)
+    monkeypatch.delenv('AINIT_LEVEL', raising=False)
+    settings = Settings(modules=[module], prefix='AINIT', dotenv_path=dotenv_path)
+    await settings.ainit()
+    assert settings.NAME == 'dotenv-name'
+
+
+@pytest.mark.asyncio
+async def test_files_loaded_in_executor(settings):
+    threads = {}
+
+    def loader(function):
+        def load(*args, **kwargs):
+            threads[function.__name__] = threading.current_thread()
+            return function(*args, **kwargs)
+        return load
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    with mock.patch.object(utils, '_get_config_dict_from_yaml', loader(utils._get_config_dict_from_yaml)), \
+            mock.patch.object(utils, '_get_config_dict_from_dotenv', loader(utils._get_config_dict_from_dotenv)):
+        await settings.ainit(executor=executor)
+    executor.shutdown()
+
+    assert set(threads) == {'_get_config_dict_from_yaml', '_get_config_dict_from_dotenv'}
+    assert threading.main_thread() not in threads.values()
+
+
+@pytest.mark.asyncio
+async def test_source_cache_filled_in_loop_thread(settings):
+    threads = []
+
+    class Cache(dict):
+        def __setitem__(self, key, value):
+            threads.append(threading.current_thread())
+            super().__setitem__(key, value)
+
+    settings._source_cache = Cache()
+    executor = ThreadPoolExecutor(max_workers=2)
+    await settings.ainit(incremental=True, executor=executor)
+    executor.shutdown()
+
+    assert set(settings._source_cache) >= {'yaml', 'dotenv'}
+    assert set(threads) == {threading.current_thread()}
+
+
+@pytest.mark.asyncio
+async def test_loop_is_not_blocked(settings):
+    def slow_yaml(*args, **kwargs):
+        time.sleep(0.2)
+        return {'PORT': 3}
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(tick())
+    with mock.patch.object(utils, '_get_config_dict_from_yaml', slow_yaml):
+        await settings.ainit()
+    task.cancel()
+
+    assert settings.PORT == 3
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_ainit_validation(tmp_path):
+    settings = Settings(yaml_settings_path=str(tmp_path / 'missing.yaml'), use_env=False)
+    with pytest.raises(ValueError):
+        await settings.ainit()
+
+
+@pytest.mark.asyncio
+async def test_ainit_freeze_and_stats(settings):
+    frozen = await settings.ainit(freeze=True, collect_stats=True)
+    assert isinstance(frozen, FrozenSettings)
+    assert frozen.PORT == 2
+    assert set(settings.last_init_stats().sources) == {'module:settings_module', 'dotenv', 'env', 'yaml'}
+
+
+@pytest.mark.asyncio
+async def test_ainit_incremental(settings):
+    await settings.ainit(incremental=True)
+    assert await settings.ainit(incremental=True) == InitSummary(sources=(), properties=())
+
+
+@pytest.mark.asyncio
+async def test_dynamic_settings_ainit(event_loop, module, yaml_path):
+    settings = DynSettings(event_loop, 1, modules=[module], yaml_settings_path=yaml_path, use_env=False)
+    await settings.ainit()
+    assert settings.HOST == 'module-host'
+    assert settings.PORT == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('lazy', [False, True])
+async def test_ainit_with_async_update_config(event_loop, module, yaml_path, lazy):
+    source = {}
+
+    class SourceSettings(DynSettings):
+        async def update_config(self, **kwargs):
+            source.update(kwargs)
+            return super().update_config(**kwargs)
+
+    settings = SourceSettings(event_loop, 1, modules=[module], yaml_settings_path=yaml_path, use_env=False)
+    summary = await settings.ainit(lazy=lazy)
+
+    assert summary.properties == ('HOST', 'PORT')
+    assert settings.HOST == 'module-host'
+    assert settings.PORT == 2
+    assert source == {}
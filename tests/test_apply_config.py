@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from magic_settings import (BaseSettings, IntProperty, SettingsValidationError, StringProperty,
+                            TransformsComplexProperty)
+
+
+class Settings(BaseSettings):
+    HOST = StringProperty(default='localhost')
+    PORT = IntProperty(default=80)
+    TIMEOUT = IntProperty(default=1)
+    DSN = TransformsComplexProperty(sequence=[HOST, PORT], transforms=[lambda host, port: f'{host}:{port}'])
+
+
+@pytest.fixture
+def settings():
+    return Settings()
+
+
+def test_apply_config(settings):
+    assert settings.DSN == 'localhost:80'
+
+    assert settings.apply_config(HOST='example.com', PORT='8080', EXTRA='extra') is settings
+
+    assert [settings.HOST, settings.PORT, settings.EXTRA] == ['example.com', 8080, 'extra']
+    assert settings.DSN == 'example.com:8080'
+
+
+def test_apply_config_all_errors(settings):
+    with pytest.raises(SettingsValidationError) as error:
+        settings.apply_config(HOST='example.com', PORT='port', TIMEOUT=1.5, DSN='dsn')
+
+    assert set(error.value.errors) == {'PORT', 'TIMEOUT', 'DSN'}
+    assert error.value.errors['DSN'] == 'Direct setting of DSN property not allowed'
+    assert "Value of TIMEOUT property should be any of <class 'int'> types" in str(error.value)
+    assert isinstance(error.value, ValueError)
+
+
+def test_apply_config_nothing_set_on_error(settings):
+    with pytest.raises(SettingsValidationError):
+        settings.apply_config(HOST='example.com', PORT='port', EXTRA='extra')
+
+    assert [settings.HOST, settings.PORT, settings.DSN] == ['localhost', 80, 'localhost:80']
+    assert not hasattr(settings, 'EXTRA')
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from magic_settings import (BaseSettings, IntProperty, Property, SettingsValidationError, StringProperty,
+                            TransformsComplexProperty, TransformsProperty)
+from magic_settings.snapshot import dump_values, load_values
+
+
+class Settings(BaseSettings, compact=True):
+    HOST = StringProperty(default='localhost')
+    PORT = IntProperty(default=8080)
+    NAME = TransformsProperty(types=str, default='index', transforms=[str.upper])
+    DSN = TransformsComplexProperty(keys={'host': HOST, 'port': PORT}, transforms=[lambda host, port: f'{host}:{port}'])
+
+
+class RegularSettings(BaseSettings):
+    HOST = StringProperty(default='localhost')
+    PORT = IntProperty(default=8080)
+
+
+def test_defaults_are_not_stored():
+    settings = Settings()
+    assert settings.HOST == 'localhost'
+    assert settings.PORT == 8080
+    assert settings.NAME == 'INDEX'
+    assert settings._slot_values is None
+    assert 'HOST' not in vars(settings)
+
+
+def test_set_values():
+    settings = Settings()
+    settings.PORT = '9000'
+    settings.update_config(NAME='api')
+    settings.apply_config(HOST='db', EXTRA='value')
+
+    assert settings.PORT == 9000
+    assert settings.NAME == 'API'
+    assert settings.DSN == 'db:9000'
+    assert settings.EXTRA == 'value'
+    assert len(settings._slot_values) == 3
+    assert not {'HOST', 'PORT', 'NAME'} & set(vars(settings))
+
+
+def test_instances_are_independent():
+    first, second = Settings(), Settings()
+    first.PORT = 1
+    assert first.PORT == 1
+    assert second.PORT == 8080
+    assert second.DSN == 'localhost:8080'
+
+
+def test_invalid_value():
+    settings = Settings()
+    with pytest.raises(SettingsValidationError):
+        settings.apply_config(PORT='port')
+    assert settings.PORT == 8080
+
+
+def test_parameters_equal_to_defaults_are_shared():
+    settings = Settings()
+    assert vars(settings) == {}
+    assert settings.modules == ()
+    assert settings.prefix == ''
+    assert settings.use_env is True
+
+    settings = Settings(prefix='APP', use_env=False)
+    assert vars(settings) == {'prefix': 'APP', 'use_env': False}
+
+
+def test_regular_settings_are_not_changed():
+    assert isinstance(vars(RegularSettings)['PORT'], IntProperty)
+    assert type(vars(RegularSettings)['PORT']) is IntProperty
+    settings = RegularSettings()
+    assert settings.modules == []
+    assert settings.PORT == 8080
+    assert vars(settings)['PORT'] == 8080
+
+
+def test_properties_registry():
+    assert list(Settings._properties) == ['DSN', 'HOST', 'NAME', 'PORT']
+    assert Settings._properties['PORT'] is vars(Settings)['PORT']
+    assert isinstance(Settings.PORT, IntProperty)
+    assert Settings._dependents['PORT'] == frozenset({'DSN'})
+
+
+def test_subclass_is_compact():
+    class SubSettings(Settings):
+        DEBUG = Property(types=bool, default=False)
+
+    settings = SubSettings()
+    settings.update_config(DEBUG=True, PORT=1)
+    assert settings.DEBUG is True
+    assert settings.PORT == 1
+    assert len(settings._slot_values) == 4
+    assert Settings()._slots_number == 3
+
+    with pytest.raises(TypeError):
+        class RegularSubSettings(Settings, compact=False):
+            pass
+
+
+def test_init(monkeypatch):
+    monkeypatch.setenv('PORT', '5000')
+    settings = Settings()
+    settings.init()
+    assert settings.PORT == 5000
+    assert settings.DSN == 'localhost:5000'
+
+
+def test_lazy_init(monkeypatch):
+    monkeypatch.setenv('PORT', '5000')
+    settings = Settings()
+    settings.PORT = 1
+    settings.init(lazy=True)
+    assert settings._lazy_values == {'PORT': '5000'}
+    assert settings.PORT == 5000
+
+
+def test_temp_set_attributes():
+    settings = Settings()
+    with settings.temp_set_attributes(PORT=1):
+        assert settings.PORT == 1
+    assert settings.PORT == 8080
+
+
+def test_dump_and_load_values():
+    settings = Settings()
+    settings.update_config(HOST='db', NAME='api')
+    copy = Settings()
+    load_values(copy, dump_values(settings))
+    assert copy.HOST == 'db'
+    assert copy.NAME == 'API'
+    assert copy.PORT == 8080
+
+
+def test_to_dict():
+    settings = Settings()
+    settings.PORT = 1
+    assert settings.to_dict()['properties'] == {'DSN': 'localhost:1', 'HOST': 'localhost', 'NAME': 'INDEX', 'PORT': 1}
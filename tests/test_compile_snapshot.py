@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import textwrap
+import types
+from unittest import mock
+
+import pytest
+
+import magic_settings
+from magic_settings import BaseSettings, Property, SharedSnapshot, StringListProperty
+from magic_settings.__main__ import main
+from magic_settings.snapshot import SnapshotError, read_snapshot, write_snapshot
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETTINGS_MODULE = '''
+from magic_settings import BaseSettings, Property, StringListProperty
+
+
+class Settings(BaseSettings):
+    HOST = Property(types=str)
+    PORT = Property(types=int, converts=[int])
+    HOSTS = StringListProperty(default=[])
+
+
+settings = Settings(prefix='COMPILE')
+'''
+
+
+class Settings(BaseSettings):
+    HOST = Property(types=str)
+    PORT = Property(types=int, converts=[int])
+    HOSTS = StringListProperty(default=[])
+
+
+@pytest.fixture
+def module():
+    module = types.ModuleType('compile_settings')
+    module.HOST = 'example.com'
+    module.PORT = '81'
+    module.HOSTS = 'a,b'
+    return module
+
+
+@pytest.fixture
+def path(tmp_path, module):
+    path = str(tmp_path / 'settings.snapshot')
+    settings = Settings(modules=[module])
+    settings.init()
+    write_snapshot(settings, path)
+    return path
+
+
+def test_from_snapshot(path):
+    with mock.patch.object(Settings, 'init') as init:
+        settings = Settings.from_snapshot(path, prefix='COMPILE')
+    init.assert_not_called()
+
+    assert settings.prefix == 'COMPILE'
+    assert settings.HOST == 'example.com'
+    assert settings.PORT == 81
+    assert settings.HOSTS == ['a', 'b']
+
+
+def test_fallback_to_init(tmp_path, module):
+    settings = Settings.from_snapshot(str(tmp_path / 'missing.snapshot'), modules=[module])
+    assert settings.PORT == 81
+
+
+def test_schema_mismatch_fallback(path, module):
+    class OtherSettings(BaseSettings):
+        HOST = Property(types=str)
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(path, OtherSettings)
+    settings = OtherSettings.from_snapshot(path, modules=[module])
+    assert settings.HOST == 'example.com'
+
+
+def test_truncated_snapshot(path):
+    with open(path, 'rb') as file:
+        content = file.read()
+    with open(path, 'wb') as file:
+        file.write(content[:-1])
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(path, Settings)
+
+
+def test_not_snapshot(tmp_path):
+    path = tmp_path / 'settings.snapshot'
+    path.write_bytes(b'{}')
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(path), Settings)
+
+
+def test_snapshot_file_can_be_shared(path):
+    settings = Settings()
+    assert SharedSnapshot.attach(path, Settings).update(settings)
+    assert settings.PORT == 81
+
+
+def run_cli(*args, cwd, env=None):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([PROJECT_DIR, str(cwd)]), **(env or {}))
+    return subprocess.run([sys.executable, '-m', 'magic_settings', *args], cwd=str(cwd), env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+
+def test_compile_command(tmp_path):
+    (tmp_path / 'compile_config.py').write_text(SETTINGS_MODULE)
+    env = {'COMPILE_HOST': 'example.com', 'COMPILE_PORT': '81'}
+    result = run_cli('compile', 'compile_config:settings', 'settings.snapshot', cwd=tmp_path, env=env)
+    assert result.returncode == 0, result.stderr
+
+    code = textwrap.dedent('''
+        from compile_config import Settings
+        settings = Settings.from_snapshot('settings.snapshot')
+        print(settings.HOST, settings.PORT)
+    ''')
+    result = subprocess.run([sys.executable, '-c', code], cwd=str(tmp_path), stdout=subprocess.PIPE, check=True,
+                            env=dict(os.environ, PYTHONPATH=PROJECT_DIR), universal_newlines=True)
+    assert result.stdout.strip() == 'example.com 81'
+
+
+def test_compile_invalid_settings(tmp_path):
+    (tmp_path / 'compile_config.py').write_text(SETTINGS_MODULE)
+    result = run_cli('compile', 'compile_config:settings', 'settings.snapshot', cwd=tmp_path)
+    assert result.returncode == 1
+    assert 'Failed to compile settings' in result.stderr
+    assert not (tmp_path / 'settings.snapshot').exists()
+
+
+@pytest.mark.parametrize('reference', ['compile_config', 'compile_config:missing', 'compile_config:SETTINGS_MODULE'])
+def test_compile_bad_reference(reference, tmp_path, monkeypatch, capsys):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'compile_config.py').write_text(SETTINGS_MODULE + '\nSETTINGS_MODULE = 1\n')
+    assert main(['compile', reference, str(tmp_path / 'settings.snapshot')]) == 1
+
+
+def test_version(capsys):
+    with pytest.raises(SystemExit):
+        main(['--version'])
+    assert capsys.readouterr().out.strip() == magic_settings.__version__
+
+
+def test_no_command(capsys):
+    assert main([]) == 2
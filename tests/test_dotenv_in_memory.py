@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import os
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseSettings, StringProperty
+from magic_settings.utils import _get_config_dict_from_dotenv
+
+
+class Settings(BaseSettings):
+    HOST = StringProperty(default='localhost')
+    NAME = StringProperty(default='name')
+
+
+@pytest.fixture
+def dotenv_path(tmp_path):
+    path = tmp_path / '.env'
+    path.write_text('MEMORY_HOST=dotenv-host\nMEMORY_NAME=dotenv-name\n')
+    return str(path)
+
+
+@pytest.mark.parametrize('override_env, expected', [
+    (True, ['dotenv-host', 'dotenv-name']),
+    (False, ['env-host', 'dotenv-name']),
+])
+def test_dotenv_not_exported(monkeypatch, dotenv_path, override_env, expected):
+    monkeypatch.setenv('MEMORY_HOST', 'env-host')
+    monkeypatch.delenv('MEMORY_NAME', raising=False)
+    settings = Settings(prefix='MEMORY', dotenv_path=dotenv_path, override_env=override_env, export_dotenv=False)
+    settings.init()
+
+    assert [settings.HOST, settings.NAME] == expected
+    assert os.environ['MEMORY_HOST'] == 'env-host'
+    assert 'MEMORY_NAME' not in os.environ
+
+
+def test_dotenv_parsed_once(dotenv_path):
+    with mock.patch('dotenv.dotenv_values', return_value={'MEMORY_HOST': 'host'}) as dotenv_values:
+        for _ in range(3):
+            assert _get_config_dict_from_dotenv(dotenv_path) == {'MEMORY_HOST': 'host'}
+
+        with open(dotenv_path, 'a') as file:
+            file.write('MEMORY_PORT=1\n')
+        _get_config_dict_from_dotenv(dotenv_path)
+
+    assert dotenv_values.call_count == 2
+
+
+def test_dotenv_variable_without_value(tmp_path):
+    path = tmp_path / '.env'
+    path.write_text('MEMORY_HOST\nMEMORY_NAME=name\n')
+
+    assert _get_config_dict_from_dotenv(str(path)) == {'MEMORY_NAME': 'name'}
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from magic_settings import BaseDynamicSettings, ComplexProperty, Property, TransformsProperty
+
+
+class DictDynamicSettings(BaseDynamicSettings):
+    def __init__(self, loop, update_period, source):
+        super().__init__(loop, update_period)
+        self.source = source
+
+    async def update_settings_from_source(self):
+        self.update_config(**self.source)
+
+
+class DynSettings(DictDynamicSettings):
+    HOST = Property(types=str)
+    PORT = Property(types=int, converts=[int])
+    LEVEL = Property(types=str, default='info')
+    ADDRESS = ComplexProperty(keys={'host': HOST, 'port': PORT})
+    UPPER_LEVEL = TransformsProperty(types=str, default='info', transforms=[str.upper])
+
+
+@pytest.fixture
+def source():
+    return {'HOST': 'localhost', 'PORT': '80'}
+
+
+@pytest.fixture
+async def dyn_settings(event_loop, source):
+    settings = DynSettings(event_loop, 0.1, source)
+    await settings.update_settings_from_source()
+    yield settings
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_subscribers(dyn_settings, source):
+    source['PORT'] = '81'
+    assert await dyn_settings.refresh() == frozenset()
+    assert dyn_settings.PORT == 81
+
+
+@pytest.mark.asyncio
+async def test_callback_on_changed_property(dyn_settings, source):
+    port_calls = []
+    level_calls = []
+    dyn_settings.subscribe(port_calls.append, 'PORT')
+    dyn_settings.subscribe(level_calls.append, 'LEVEL')
+
+    assert await dyn_settings.refresh() == frozenset()
+    assert port_calls == []
+
+    source['PORT'] = '81'
+    assert await dyn_settings.refresh() == {'PORT', 'ADDRESS'}
+    assert port_calls == [{'PORT'}]
+    assert level_calls == []
+
+
+@pytest.mark.asyncio
+async def test_subscribe_again_replaces_names(dyn_settings, source):
+    calls = []
+    dyn_settings.subscribe(calls.append, 'PORT')
+    dyn_settings.subscribe(calls.append, 'HOST')
+
+    source['PORT'] = '81'
+    await dyn_settings.refresh()
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_callback_on_all_properties(dyn_settings, source):
+    calls = []
+    dyn_settings.subscribe(calls.append)
+
+    source['HOST'] = 'example.com'
+    source['UPPER_LEVEL'] = 'debug'
+    await dyn_settings.refresh()
+    assert calls == [{'HOST', 'ADDRESS', 'UPPER_LEVEL'}]
+
+
+@pytest.mark.asyncio
+async def test_group_callback(dyn_settings, source):
+    calls = []
+    dyn_settings.subscribe(calls.append, 'ADDRESS', 'LEVEL')
+
+    source['HOST'] = 'example.com'
+    await dyn_settings.refresh()
+    assert calls == [{'ADDRESS'}]
+
+
+@pytest.mark.asyncio
+async def test_async_callback(dyn_settings, source):
+    calls = []
+
+    async def callback(changed):
+        await asyncio.sleep(0)
+        calls.append(changed)
+
+    dyn_settings.subscribe(callback, 'PORT')
+    source['PORT'] = '81'
+    await dyn_settings.refresh()
+    assert calls == [{'PORT'}]
+
+
+@pytest.mark.asyncio
+async def test_callback_error(dyn_settings, source, caplog):
+    calls = []
+
+    def fail(changed):
+        raise RuntimeError('boom')
+
+    dyn_settings.subscribe(fail, 'PORT')
+    dyn_settings.subscribe(calls.append, 'PORT')
+    source['PORT'] = '81'
+    await dyn_settings.refresh()
+
+    assert calls == [{'PORT'}]
+    assert 'boom' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe(dyn_settings, source):
+    calls = []
+    dyn_settings.subscribe(calls.append)
+    dyn_settings.unsubscribe(calls.append)
+
+    source['PORT'] = '81'
+    await dyn_settings.refresh()
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_partial_update_notified_by_next_refresh(dyn_settings, source):
+    calls = []
+    dyn_settings.subscribe(calls.append, 'HOST')
+    await dyn_settings.refresh()
+
+    source.update(HOST='new', PORT='bad')
+    with pytest.raises(ValueError):
+        await dyn_settings.refresh()
+    assert dyn_settings.HOST == 'new'
+
+    source['PORT'] = '81'
+    await dyn_settings.refresh()
+    assert calls == [{'HOST'}]
+
+
+def test_subscribe_unknown_property(event_loop, source):
+    settings = DynSettings(event_loop, 0.1, source)
+    with pytest.raises(ValueError):
+        settings.subscribe(print, 'UNKNOWN')
+
+
+@pytest.mark.asyncio
+async def test_update_loop_notifies(dyn_settings, source):
+    calls = []
+    dyn_settings.subscribe(calls.append, 'PORT')
+
+    await dyn_settings.start_update()
+    source['PORT'] = '81'
+    await asyncio.sleep(0.3)
+    await dyn_settings.stop_update()
+
+    assert calls == [{'PORT'}]
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+from magic_settings import DynamicSettingsSourceError, FileDynamicSettings, Property
+from magic_settings import file_dynamic_settings
+
+
+class FileSettings(FileDynamicSettings):
+    HOST = Property(types=str)
+    PORT = Property(types=int, converts=[int])
+
+
+def write(path, content):
+    """Rewrite file making sure its stat changes"""
+    with open(path, 'w') as file:
+        file.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+
+@pytest.fixture
+def yaml_path(tmp_path):
+    path = tmp_path / 'settings.yaml'
+    path.write_text('PORT: 80\n')
+    return str(path)
+
+
+@pytest.fixture
+def dotenv_path(tmp_path):
+    path = tmp_path / '.env'
+    path.write_text('HOST=localhost\nPORT=8080\n')
+    return str(path)
+
+
+@pytest.fixture
+def settings(event_loop, yaml_path, dotenv_path):
+    return FileSettings(event_loop, 60, yaml_settings_path=yaml_path, dotenv_path=dotenv_path)
+
+
+def test_no_paths(event_loop):
+    with pytest.raises(ValueError):
+        FileSettings(event_loop, 60)
+
+
+@pytest.mark.asyncio
+async def test_update(settings, yaml_path):
+    await settings.update_settings_from_source()
+    assert settings.HOST == 'localhost'
+    assert settings.PORT == 80
+
+    write(yaml_path, 'PORT: 81\n')
+    await settings.update_settings_from_source()
+    assert settings.PORT == 81
+
+
+@pytest.mark.asyncio
+async def test_unchanged_files_are_not_parsed(settings):
+    await settings.update_settings_from_source()
+    with mock.patch.object(file_dynamic_settings, '_get_config_dict_from_yaml') as load, \
+            mock.patch.object(FileSettings, 'apply_source_payload') as apply_source_payload:
+        await settings.update_settings_from_source()
+    load.assert_not_called()
+    apply_source_payload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_symlink_swap(event_loop, tmp_path):
+    for name, port in (('v1', 80), ('v2', 81)):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'settings.yaml').write_text(f'HOST: localhost\nPORT: {port}\n')
+    os.symlink('v1', str(tmp_path / 'data'))
+    settings = FileSettings(event_loop, 60, yaml_settings_path=str(tmp_path / 'data' / 'settings.yaml'))
+    await settings.update_settings_from_source()
+    assert settings.PORT == 80
+
+    os.symlink('v2', str(tmp_path / 'data_tmp'))
+    os.replace(str(tmp_path / 'data_tmp'), str(tmp_path / 'data'))
+    await settings.update_settings_from_source()
+    assert settings.PORT == 81
+
+
+@pytest.mark.asyncio
+async def test_missing_file(event_loop, tmp_path):
+    settings = FileSettings(event_loop, 60, yaml_settings_path=str(tmp_path / 'missing.yaml'))
+    with pytest.raises(DynamicSettingsSourceError):
+        await settings.update_settings_from_source()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is available on Linux only')
+async def test_watch(settings, yaml_path):
+    await settings.update_settings_from_source()
+    await settings.start_update()
+    assert settings._watcher is not None
+
+    write(yaml_path, 'PORT: 81\n')
+    for _ in range(50):
+        if settings.PORT == 81:
+            break
+        await asyncio.sleep(0.01)
+    await settings.stop_update()
+
+    assert settings.PORT == 81
+    assert settings._watcher is None
+
+
+@pytest.mark.asyncio
+async def test_without_watch(event_loop, yaml_path):
+    settings = FileSettings(event_loop, 60, yaml_settings_path=yaml_path, watch=False)
+    await settings.start_update()
+    assert settings._watcher is None
+    await settings.stop_update()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('content', ['PORT: [81\n', 'PORT\n', 'PORT:\n  NESTED: 81\n'])
+async def test_invalid_yaml_keeps_values(settings, yaml_path, content):
+    await settings.update_settings_from_source()
+    write(yaml_path, content)
+    with pytest.raises(DynamicSettingsSourceError):
+        await settings.update_settings_from_source()
+    assert settings.PORT == 80
+
+    write(yaml_path, 'PORT: 81\n')
+    await settings.update_settings_from_source()
+    assert settings.PORT == 81
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_watch_task(settings):
+    await settings.start_update()
+    watch_task = settings._watch_task = settings.loop.create_task(asyncio.sleep(60))
+    await settings.stop_update()
+    assert watch_task.cancelled()
+    assert settings._watch_task is None
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from magic_settings import (BaseSettings, FrozenSettings, InitSummary, IntProperty, Property, StringProperty,
+                            TransformsComplexProperty)
+from tests.files import base
+
+
+class Settings(BaseSettings):
+    TEST_PROP = StringProperty()
+    PREFIX = StringProperty()
+    PORT = IntProperty(default=8080)
+    PAIR = TransformsComplexProperty(sequence=[TEST_PROP, PREFIX], transforms=[lambda a, b: f'{a}:{b}'])
+
+
+@pytest.fixture
+def settings():
+    return Settings(modules=[base], use_env=False)
+
+
+def test_init_freeze(settings):
+    frozen = settings.init(freeze=True)
+
+    assert isinstance(frozen, FrozenSettings)
+    assert frozen.TEST_PROP == 'BASE_PROPERTY'
+    assert frozen.PREFIX == 'BASE_ENV'
+    assert frozen.PORT == 8080
+    assert frozen.PAIR == 'BASE_PROPERTY:BASE_ENV'
+    assert frozen._asdict() == {
+        'PAIR': 'BASE_PROPERTY:BASE_ENV', 'PORT': 8080, 'PREFIX': 'BASE_ENV', 'TEST_PROP': 'BASE_PROPERTY',
+    }
+
+
+def test_init_without_freeze(settings):
+    assert isinstance(settings.init(), InitSummary)
+
+
+def test_frozen_is_read_only(settings):
+    frozen = settings.init(freeze=True)
+
+    with pytest.raises(AttributeError, match='read-only'):
+        frozen.PORT = 1
+    with pytest.raises(AttributeError, match='read-only'):
+        del frozen.PORT
+    with pytest.raises(AttributeError):
+        frozen.__dict__
+    assert frozen.PORT == 8080
+
+
+def test_frozen_is_snapshot(settings):
+    settings.init()
+    frozen = settings.freeze()
+    settings.PORT = '9090'
+
+    assert settings.PORT == 9090
+    assert frozen.PORT == 8080
+    assert type(settings.freeze()) is type(frozen)
+
+
+def test_freeze_undefined(settings):
+    with pytest.raises(ValueError, match='Undefined value of required PREFIX property'):
+        settings.freeze()
+
+
+def test_frozen_class_per_settings_class():
+    class OtherSettings(BaseSettings):
+        FOO = Property(types=str, default='foo')
+
+    frozen = OtherSettings().freeze()
+
+    assert type(frozen).__name__ == 'FrozenOtherSettings'
+    assert frozen.FOO == 'foo'
+    assert not hasattr(frozen, 'PORT')
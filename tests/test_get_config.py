@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 import os
+from unittest import mock
 
 import pytest
+import yaml
 
 from magic_settings import BaseSettings, Property, NoneType
 from magic_settings.utils import _get_config_dict_from_yaml, _get_config_dict_from_module, _get_config_dict_from_env
 from tests.files import base, local, test_module
 
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class TestSettings(BaseSettings):
     PROJECT_DIR = Property(types=str, default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -110,8 +114,78 @@ def test_get_config_dict_from_module(module, expected):
         '+-%': 'What???',
     }),
 
+    ({
+        'prefix': 'DUCK',
+        'names': ['INT', '_INT', 'DUCKGO', 'MISSING'],
+        'environ': {
+            'DUCK_INT': '3',
+            'DUCKDUCKGO': 'duckduckgo.com',
+            'DUCK__INT': '5',
+            'PSY_DUCK': 'ABC',
+        }
+    }, {
+        'INT': '3',
+        '_INT': '5',
+    }),
+
+    ({
+        'prefix': '',
+        'names': ['DUCK_INT', 'MISSING'],
+        'environ': {
+            'DUCK_INT': '3',
+            'DUCKDUCKGO': 'duckduckgo.com',
+            'PSY_DUCK': 'ABC',
+        }
+    }, {
+        'DUCK_INT': '3',
+    }),
+
 ))
 def test_get_config_dict_from_env(params, expected):
     """Test _get_config_dict_from_env method creates the dictionary correctly."""
     actual = _get_config_dict_from_env(**params)
     assert actual == expected
+
+
+def test_get_config_dict_from_yaml_cache(tmp_path):
+    """Dict parsed from yaml is taken from cache while file content is unchanged"""
+    path = tmp_path / 'settings.yaml'
+    path.write_text('STR: bar\nINT: 123\n')
+    cache_dir = str(tmp_path / 'cache')
+
+    assert _get_config_dict_from_yaml(str(path), cache_dir=cache_dir) == {'STR': 'bar', 'INT': 123}
+    assert len(os.listdir(cache_dir)) == 1
+
+    with mock.patch('yaml.load') as load:
+        assert _get_config_dict_from_yaml(str(path), cache_dir=cache_dir) == {'STR': 'bar', 'INT': 123}
+    load.assert_not_called()
+
+    path.write_text('STR: foo\nINT: 321\n')
+    assert _get_config_dict_from_yaml(str(path), cache_dir=cache_dir) == {'STR': 'foo', 'INT': 321}
+
+
+def test_get_config_dict_from_yaml_broken_cache(tmp_path):
+    path = tmp_path / 'settings.yaml'
+    path.write_text('STR: bar\n')
+    cache_dir = tmp_path / 'cache'
+    _get_config_dict_from_yaml(str(path), cache_dir=str(cache_dir))
+    for cache_file in cache_dir.iterdir():
+        cache_file.write_bytes(b'broken')
+
+    assert _get_config_dict_from_yaml(str(path), cache_dir=str(cache_dir)) == {'STR': 'bar'}
+
+
+def test_settings_yaml_cache(tmp_path):
+    settings = TestSettings(yaml_settings_path=os.path.join(TEST_DIR, 'files', 'yaml_config_test.yaml'),
+                            yaml_cache_dir=str(tmp_path), use_env=False)
+    settings.init()
+
+    assert settings.STR == 'bar'
+    assert len(os.listdir(str(tmp_path))) == 1
+
+
+@pytest.mark.skipif(not hasattr(yaml, 'CSafeLoader'), reason='PyYaml is built without libyaml')
+def test_get_config_dict_from_yaml_c_loader():
+    with mock.patch('yaml.load', return_value={}) as load:
+        _get_config_dict_from_yaml(os.path.join(TEST_DIR, 'files', 'yaml_config_test.yaml'))
+    assert load.call_args[1]['Loader'] is yaml.CSafeLoader
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# generous budget for cumulative import time of the package, in microseconds
+IMPORT_TIME_BUDGET = 300000
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=PROJECT_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+
+
+def test_optional_dependencies_not_imported():
+    """python-dotenv and PyYaml are imported only when sources need them"""
+    code = 'import sys, magic_settings; print(sorted({"dotenv", "yaml"} & set(sys.modules)))'
+    assert run_python('-c', code).stdout.strip() == '[]'
+
+
+def test_snapshot_modules_not_imported():
+    """pickle and mmap are imported only when snapshots are used"""
+    code = 'import sys, magic_settings; print(sorted({"pickle", "mmap"} & set(sys.modules)))'
+    assert run_python('-c', code).stdout.strip() == '[]'
+
+
+def test_import_time_budget():
+    def import_time():
+        for line in run_python('-X', 'importtime', '-c', 'import magic_settings').stderr.splitlines():
+            _, cumulative, name = line.split('|')
+            if name.strip() == 'magic_settings':
+                return int(cumulative)
+
+    assert min(import_time() for _ in range(3)) < IMPORT_TIME_BUDGET
+
+
+def test_missing_yaml_error():
+    code = '\n'.join([
+        'import sys',
+        'sys.modules["yaml"] = None',
+        'from magic_settings import BaseSettings',
+        'try:',
+        '    BaseSettings(yaml_settings_path="settings.yaml")',
+        'except ValueError as e:',
+        '    print(e)',
+    ])
+    assert run_python('-c', code).stdout.strip() == ('To use yaml_settings_path you need install PyYaml library.'
+                                                     'Use magic-settings[yaml] to install it.')
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from magic_settings import BaseSettings, InitSummary, IntProperty, StringProperty
+
+
+class Settings(BaseSettings):
+    HOST = StringProperty()
+    PORT = IntProperty()
+    NAME = StringProperty(default='name')
+
+
+@pytest.fixture
+def settings(module, yaml_path, monkeypatch):
+    monkeypatch.setenv('INCR_NAME', 'env-name')
+    return Settings(modules=[module], prefix='INCR', yaml_settings_path=yaml_path, declared_env_only=True)
+
+
+def write(path, content):
+    """Rewrite file making sure its stat changes"""
+    with open(path, 'w') as file:
+        file.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_first_init_applies_everything(settings):
+    summary = settings.init(incremental=True)
+
+    assert summary == InitSummary(sources=('module:settings_module', 'env', 'yaml'),
+                                  properties=('HOST', 'PORT', 'NAME'))
+    assert [settings.HOST, settings.PORT, settings.NAME] == ['module-host', 2, 'env-name']
+
+
+def test_nothing_changed(settings):
+    settings.init(incremental=True)
+
+    assert settings.init(incremental=True) == InitSummary(sources=(), properties=())
+    assert [settings.HOST, settings.PORT, settings.NAME] == ['module-host', 2, 'env-name']
+
+
+def test_file_changed(settings, yaml_path):
+    settings.init(incremental=True)
+    write(yaml_path, 'PORT: 3\n')
+
+    assert settings.init(incremental=True) == InitSummary(sources=('yaml',), properties=('PORT',))
+    assert settings.PORT == 3
+
+
+def test_file_touched(settings, yaml_path):
+    settings.init(incremental=True)
+    write(yaml_path, 'PORT: 2\n')
+
+    assert settings.init(incremental=True) == InitSummary(sources=(), properties=())
+
+
+def test_env_changed(settings, monkeypatch):
+    settings.init(incremental=True)
+    monkeypatch.setenv('INCR_NAME', 'new-name')
+
+    assert settings.init(incremental=True) == InitSummary(sources=('env',), properties=('NAME',))
+    assert settings.NAME == 'new-name'
+
+
+def test_overridden_source_changed(settings, module):
+    """Changed value of module is not applied while yaml overrides it"""
+    settings.init(incremental=True)
+    module.__version__ = '2'
+    module.PORT = 10
+
+    assert settings.init(incremental=True) == InitSummary(sources=('module:settings_module',), properties=())
+    assert settings.PORT == 2
+
+
+def test_full_init_reloads_everything(settings):
+    settings.init(incremental=True)
+    settings.PORT = 5
+
+    assert settings.init() == InitSummary(sources=('module:settings_module', 'env', 'yaml'),
+                                          properties=('HOST', 'PORT', 'NAME'))
+    assert settings.PORT == 2
+
+
+def test_failed_init_is_retried(settings, yaml_path):
+    """Whole config is applied again after failed init"""
+    settings.init(incremental=True)
+    write(yaml_path, 'PORT: not a number\n')
+    with pytest.raises(ValueError):
+        settings.init(incremental=True)
+
+    write(yaml_path, 'PORT: 4\n')
+    assert settings.init(incremental=True).properties == ('HOST', 'PORT', 'NAME')
+    assert settings.PORT == 4
+    assert settings.init(incremental=True).properties == ()
@@ -37,6 +37,24 @@ def test_init_settings(modules, prefix, dotenv_path, override_env, yaml_settings
     assert [settings.USE_YAML, settings.PREFIX, settings.TEST_PROP] == expected
 
 
+@pytest.mark.parametrize('prefix, declared_env_only, expected', [
+    ('ENV', True, ['ENV_ENV', 'ENV_PROPERTY', False]),
+    ('ENV', False, ['ENV_ENV', 'ENV_PROPERTY', True]),
+    (None, True, ['BASE_ENV', 'BASE_PROPERTY', False]),
+    (None, False, ['BASE_ENV', 'BASE_PROPERTY', True]),
+])
+def test_init_declared_env_only(monkeypatch, prefix, declared_env_only, expected):
+    """Only environment variables named after properties are applied with declared_env_only"""
+    monkeypatch.setenv('ENV_PREFIX', 'ENV_ENV')
+    monkeypatch.setenv('ENV_TEST_PROP', 'ENV_PROPERTY')
+    monkeypatch.setenv('ENV_UNDECLARED', 'value')
+    monkeypatch.setenv('UNDECLARED', 'value')
+    settings = TestSettings(modules=[base], prefix=prefix, declared_env_only=declared_env_only)
+    settings.init()
+
+    assert [settings.PREFIX, settings.TEST_PROP, hasattr(settings, 'UNDECLARED')] == expected
+
+
 def test_init_with_bad_module():
     """Test init with bad parameters"""
     with pytest.raises(ValueError, match=r'not_module type is not ModuleType or NoneType'):
@@ -158,3 +176,30 @@ def test_settings_dict_format():
             }
         ]
     }
+
+
+class InheritedSettings(TestSettings):
+    EXTRA_PROP = Property(types=str, default='extra')
+    TEST_PROP = Property(types=str, default='overridden')
+
+
+def test_properties_registry():
+    """Properties registry follows MRO, is sorted by name and is read-only"""
+    settings = InheritedSettings()
+
+    assert [prop.name for prop in settings.properties] == ['EXTRA_PROP', 'PREFIX', 'TEST_PROP', 'USE_YAML']
+    assert InheritedSettings._properties['TEST_PROP'] is InheritedSettings.__dict__['TEST_PROP']
+    with pytest.raises(TypeError):
+        InheritedSettings._properties['FOO'] = Property(types=str)
+
+
+def test_inherited_properties_dict():
+    settings = InheritedSettings(modules=[base], use_env=False)
+    settings.init()
+
+    assert settings.to_dict()['properties'] == {
+        'EXTRA_PROP': 'extra',
+        'PREFIX': 'BASE_ENV',
+        'TEST_PROP': 'BASE_PROPERTY',
+        'USE_YAML': False,
+    }
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from magic_settings import BaseSettings, InitStats, IntProperty, Property, StringProperty
+
+
+class Settings(BaseSettings):
+    HOST = StringProperty()
+    PORT = IntProperty()
+    NAME = StringProperty(default='name')
+    LEVEL = Property(types=int, converts=[int], validators=[lambda value: value > 0])
+
+
+@pytest.fixture
+def settings(module, yaml_path, monkeypatch):
+    monkeypatch.setenv('STATS_NAME', 'env-name')
+    monkeypatch.setenv('STATS_LEVEL', '3')
+    return Settings(modules=[module], prefix='STATS', yaml_settings_path=yaml_path, declared_env_only=True)
+
+
+def test_stats_not_collected_by_default(settings):
+    settings.init()
+    assert settings.last_init_stats() is None
+
+
+def test_stats(settings):
+    settings.init(collect_stats=True)
+    stats = settings.last_init_stats()
+
+    assert isinstance(stats, InitStats)
+    assert set(stats.sources) == {'module:settings_module', 'env', 'yaml'}
+    assert stats.keys == {'module:settings_module': 1, 'env': 2, 'yaml': 1}
+    assert set(stats.convert) == set(stats.validate) == {'HOST', 'PORT', 'NAME', 'LEVEL'}
+    assert stats.total >= sum(stats.sources.values())
+    assert settings.HOST == 'module-host'
+    assert settings.PORT == 2
+    assert settings.NAME == 'env-name'
+    assert settings.LEVEL == 3
+
+
+def test_stats_dotenv_source(tmp_path, monkeypatch):
+    dotenv_path = tmp_path / '.env'
+    dotenv_path.write_text('STATS_HOST=dotenv-host\nSTATS_PORT=1\nSTATS_LEVEL=1\n')
+    for name in ('STATS_HOST', 'STATS_PORT', 'STATS_LEVEL'):
+        monkeypatch.delenv(name, raising=False)
+    settings = Settings(prefix='STATS', dotenv_path=str(dotenv_path), export_dotenv=False)
+    settings.init(collect_stats=True)
+
+    assert set(settings.last_init_stats().sources) == {'dotenv', 'env'}
+    assert settings.HOST == 'dotenv-host'
+
+
+def test_stats_incremental(settings):
+    settings.init(incremental=True)
+    settings.init(incremental=True, collect_stats=True)
+    stats = settings.last_init_stats()
+
+    assert stats.keys == {}
+    assert stats.convert == {}
+
+
+def test_stats_validation_error(settings, yaml_path):
+    with open(yaml_path, 'w') as file:
+        file.write('LEVEL: "-1"\n')
+
+    with pytest.raises(ValueError):
+        settings.init(collect_stats=True)
+    assert settings.last_init_stats() is None
+
+
+def test_stats_use_property_setter(monkeypatch):
+    class UpperProperty(Property):
+        def __set__(self, instance, value):
+            super().__set__(instance, value.upper())
+
+    class CustomSettings(BaseSettings):
+        HOST = UpperProperty(types=str)
+        PORT = Property(types=int, converts=[int], cache_size=4)
+
+    monkeypatch.setenv('STATS_HOST', 'host')
+    monkeypatch.setenv('STATS_PORT', '80')
+    settings = CustomSettings(prefix='STATS', declared_env_only=True)
+    settings.init(collect_stats=True)
+    stats = settings.last_init_stats()
+
+    assert settings.HOST == 'HOST'
+    assert settings.PORT == 80
+    assert CustomSettings.PORT._clean.cache_info().currsize == 1
+    assert set(stats.convert) == {'HOST', 'PORT'}
+    assert stats.validate == {}
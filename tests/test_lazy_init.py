@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import types
+from unittest import mock
+
+import pytest
+
+from magic_settings import (BaseSettings, IntProperty, SettingsValidationError, StringProperty,
+                            TransformsComplexProperty)
+
+
+def make_settings(**values):
+    module = types.ModuleType('lazy_settings')
+    for name, value in values.items():
+        setattr(module, name, value)
+
+    class Settings(BaseSettings):
+        HOST = StringProperty()
+        PORT = IntProperty(default=80)
+        TIMEOUT = IntProperty(default=1)
+        DSN = TransformsComplexProperty(sequence=[HOST, PORT], transforms=[lambda host, port: f'{host}:{port}'])
+
+    return Settings(modules=[module], use_env=False)
+
+
+def test_values_converted_on_read():
+    settings = make_settings(HOST='localhost', PORT='8080', EXTRA='extra')
+
+    with mock.patch.object(IntProperty, '__set__', autospec=True, side_effect=IntProperty.__set__) as set_value:
+        settings.init(lazy=True)
+        set_value.assert_not_called()
+        assert settings.EXTRA == 'extra'
+
+        assert settings.PORT == 8080
+        assert settings.PORT == 8080
+        set_value.assert_called_once()
+
+    assert settings.HOST == 'localhost'
+    assert settings.TIMEOUT == 1
+    assert settings.DSN == 'localhost:8080'
+
+
+def test_invalid_value_raises_on_read():
+    settings = make_settings(HOST='localhost', PORT='port')
+    settings.init(lazy=True)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match='Failed to convert property PORT'):
+            settings.PORT
+
+
+def test_undefined_value():
+    settings = make_settings(PORT='8080')
+
+    with pytest.raises(ValueError, match='Undefined value of required HOST property'):
+        settings.init(lazy=True)
+
+
+def test_validate_all():
+    settings = make_settings(HOST='localhost', PORT='port', TIMEOUT='timeout')
+    settings.init(lazy=True)
+
+    with pytest.raises(SettingsValidationError) as error:
+        settings.validate_all()
+    assert set(error.value.errors) == {'PORT', 'TIMEOUT'}
+
+    settings = make_settings(HOST='localhost', PORT='8080')
+    settings.init(lazy=True)
+    settings.validate_all()
+    assert settings._lazy_values == {}
+    assert settings.__dict__['PORT'] == 8080
+
+
+def test_lazy_reinit_drops_resolved_value():
+    settings = make_settings(HOST='localhost', PORT='8080')
+    settings.init(lazy=True)
+    assert settings.DSN == 'localhost:8080'
+
+    settings.modules[0].PORT = '9090'
+    settings.init(lazy=True)
+    assert settings.DSN == 'localhost:9090'
+
+
+def test_eager_init_after_lazy():
+    settings = make_settings(HOST='localhost', PORT='8080')
+    settings.init(lazy=True)
+    settings.init()
+
+    assert settings._lazy_values == {}
+    assert settings.__dict__['PORT'] == 8080
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_set_value_replaces_deferred_value(compact):
+    class Settings(BaseSettings, compact=compact):
+        PORT = IntProperty(default=80)
+        TIMEOUT = IntProperty(default=1)
+
+    module = types.ModuleType('lazy_settings')
+    module.PORT = '8080'
+    module.TIMEOUT = '5'
+    settings = Settings(modules=[module], use_env=False)
+    settings.init(lazy=True)
+
+    settings.PORT = 9090
+    settings.apply_config(TIMEOUT=10)
+    settings.validate_all()
+    assert settings.PORT == 9090
+    assert settings.TIMEOUT == 10
+    assert settings._lazy_values == {}
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseSettings, HostListProperty, IntProperty, Property, StringListProperty
+
+
+def make_settings(converter, validator, cache_size=16):
+    class Settings(BaseSettings):
+        VALUE = Property(types=int, converts=[converter], validators=[validator], cache_size=cache_size)
+    return Settings()
+
+
+def test_repeated_value_is_not_converted_again():
+    converter = mock.Mock(side_effect=int)
+    validator = mock.Mock(return_value=True)
+    settings = make_settings(converter, validator)
+
+    settings.VALUE = '1'
+    settings.VALUE = '1'
+    settings.update_config(VALUE='1')
+    assert settings.VALUE == 1
+    assert converter.call_count == 1
+    assert validator.call_count == 1
+
+    settings.VALUE = '2'
+    assert settings.VALUE == 2
+    assert converter.call_count == 2
+
+
+def test_without_cache_size():
+    converter = mock.Mock(side_effect=int)
+    settings = make_settings(converter, lambda value: True, cache_size=None)
+    settings.VALUE = '1'
+    settings.VALUE = '1'
+    assert converter.call_count == 2
+
+
+def test_invalid_value_is_not_remembered():
+    calls = []
+
+    def positive(value):
+        calls.append(value)
+        return value > 0
+
+    settings = make_settings(int, positive)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            settings.VALUE = '-1'
+    assert calls == [-1, -1]
+
+
+def test_cache_is_bounded():
+    converter = mock.Mock(side_effect=int)
+    settings = make_settings(converter, lambda value: True, cache_size=2)
+    for value in ('1', '2', '3', '1'):
+        settings.VALUE = value
+    assert converter.call_count == 4
+    assert type(settings).VALUE._clean.cache_info().currsize == 2
+
+
+def test_typed_values():
+    class Settings(BaseSettings):
+        VALUE = Property(types=(int, float, bool), cache_size=16)
+
+    settings = Settings()
+    settings.VALUE = 1
+    settings.VALUE = True
+    assert settings.VALUE is True
+    settings.VALUE = 1.0
+    assert type(settings.VALUE) is float
+
+
+def test_unhashable_values_are_not_remembered():
+    validator = mock.Mock(return_value=True)
+
+    class Settings(BaseSettings):
+        VALUE = Property(types=list, validators=[validator], cache_size=16)
+
+    settings = Settings()
+    settings.VALUE = ['a']
+    settings.VALUE = ['a']
+    assert validator.call_count == 2
+    assert type(settings).VALUE._clean.cache_info().currsize == 0
+
+
+def test_mutable_results_are_copied():
+    class Settings(BaseSettings):
+        HOSTS = StringListProperty(cache_size=16)
+        ADDRESSES = HostListProperty(cache_size=16)
+
+    first, second = Settings(), Settings()
+    first.HOSTS = second.HOSTS = 'a,b'
+    first.HOSTS.append('c')
+    assert second.HOSTS == ['a', 'b']
+
+    first.ADDRESSES = second.ADDRESSES = 'a:1'
+    assert first.ADDRESSES == second.ADDRESSES == [('a', 1)]
+    assert first.ADDRESSES is not second.ADDRESSES
+
+
+def test_nested_results_are_copied():
+    class Settings(BaseSettings):
+        OPTS = Property(types=dict, converts=[json.loads], cache_size=8)
+
+    first, second = Settings(), Settings()
+    first.OPTS = '{"pool": {"size": 1}}'
+    first.OPTS['pool']['size'] = 99
+    second.OPTS = '{"pool": {"size": 1}}'
+    assert second.OPTS == {'pool': {'size': 1}}
+    assert type(second).OPTS._clean.cache_info().hits == 1
+
+
+def test_special_property_cache():
+    class Settings(BaseSettings):
+        PORT = IntProperty(cache_size=4)
+
+    settings = Settings()
+    settings.PORT = '80'
+    settings.PORT = '80'
+    assert type(settings).PORT._clean.cache_info().hits == 1
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseSettings, BoolProperty, IntProperty, Property
+
+
+def positive(value):
+    return value > 0
+
+
+class Settings(BaseSettings):
+    LEVEL = Property(choices=['DEBUG', 'INFO'], default='INFO')
+    NUMBER = Property(choices=[1, 2, 3], converts=[int], default=1)
+    PAIR = Property(choices=[['a', 'b'], ['c', 'd']], default=['a', 'b'])
+    POSITIVE = IntProperty(validators=[positive], default=1)
+    FLAG = BoolProperty(default=False)
+    ANY = Property(default=None)
+
+
+@pytest.fixture
+def settings():
+    return Settings()
+
+
+@pytest.mark.parametrize('name, value, expected', [
+    ('LEVEL', 'DEBUG', 'DEBUG'),
+    ('NUMBER', '2', 2),
+    ('NUMBER', 3, 3),
+    ('PAIR', ['c', 'd'], ['c', 'd']),
+    ('POSITIVE', '10', 10),
+    ('FLAG', 'TRUE', True),
+    ('FLAG', False, False),
+    ('ANY', {'a': 1}, {'a': 1}),
+])
+def test_set(settings, name, value, expected):
+    setattr(settings, name, value)
+    assert getattr(settings, name) == expected
+
+
+@pytest.mark.parametrize('name, value, message', [
+    ('LEVEL', 'WARNING', 'Value of LEVEL property should be equal to any of DEBUG, INFO'),
+    ('LEVEL', ['DEBUG'], 'Value of LEVEL property should be equal to any of DEBUG, INFO'),
+    ('NUMBER', '4', 'Value of NUMBER property should be equal to any of 1, 2, 3'),
+    ('NUMBER', 'one', "Failed to convert property NUMBER with error: invalid literal for int"),
+    ('PAIR', ['a', 'c'], r"Value of PAIR property should be equal to any of \['a', 'b'\], \['c', 'd'\]"),
+    ('POSITIVE', '-1', 'Property POSITIVE falls validation on positive'),
+    ('POSITIVE', 1.5, "Value of POSITIVE property should be any of <class 'int'> types"),
+    ('FLAG', 'yes', 'Failed to convert property FLAG with error'),
+])
+def test_set_invalid(settings, name, value, message):
+    with pytest.raises(ValueError, match=message):
+        setattr(settings, name, value)
+
+
+def test_pre_validate_once_per_class():
+    class CheckedSettings(Settings):
+        pass
+
+    class OtherCheckedSettings(Settings):
+        pass
+
+    with mock.patch.object(BaseSettings, '_validate_default') as validate_default:
+        CheckedSettings().pre_validate()
+        CheckedSettings().init()
+        assert validate_default.call_count == len(Settings._properties)
+
+        OtherCheckedSettings().pre_validate()
+        assert validate_default.call_count == 2 * len(Settings._properties)
+
+
+def test_failed_pre_validate_is_repeated():
+    class BadSettings(BaseSettings):
+        LEVEL = Property(choices=['DEBUG', 'INFO'], default='WARNING')
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match='Default value of LEVEL property should be any of'):
+            BadSettings().pre_validate()
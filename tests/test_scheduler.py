@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from magic_settings import BaseDynamicSettings, Property, RefreshScheduler
+from magic_settings.scheduler import _Entry, get_scheduler
+
+
+class CountingSettings(BaseDynamicSettings):
+    VALUE = Property(types=int, default=0)
+
+    def __init__(self, loop, update_period, fail=0, **kwargs):
+        super().__init__(loop, update_period, **kwargs)
+        self.calls = 0
+        self.fail = fail
+
+    async def update_settings_from_source(self):
+        self.calls += 1
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError('source is unavailable')
+        self.VALUE = self.calls
+
+
+@pytest.fixture
+async def scheduler(event_loop):
+    scheduler = RefreshScheduler(loop=event_loop, jitter=0)
+    yield scheduler
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_refresh_many_settings(event_loop, scheduler):
+    settings = [CountingSettings(event_loop, 0.05, scheduler=scheduler) for _ in range(20)]
+    for item in settings:
+        await item.start_update()
+    await asyncio.sleep(0.3)
+
+    assert all(item.calls >= 2 for item in settings)
+    assert all(scheduler.stats(item).refreshes == item.calls for item in settings)
+    assert all(item.task is None for item in settings)
+
+
+@pytest.mark.asyncio
+async def test_backoff_and_recovery(event_loop, scheduler):
+    scheduler.backoff_factor = 2
+    settings = CountingSettings(event_loop, 0.02, fail=3, task_retries_number=0, scheduler=scheduler)
+    await settings.start_update()
+    while not scheduler.stats(settings).failures:
+        await asyncio.sleep(0.005)
+
+    stats = scheduler.stats(settings)
+    assert stats.failures == 1
+    assert stats.consecutive_failures == 1
+    assert isinstance(stats.last_error, ConnectionError)
+    # 0.02 * 2 ** 1
+    assert stats.next_refresh - event_loop.time() == pytest.approx(0.04, abs=0.01)
+
+    await asyncio.sleep(0.6)
+    stats = scheduler.stats(settings)
+    assert stats.failures == 3
+    assert stats.consecutive_failures == 0
+    assert stats.refreshes >= 1
+    assert settings.VALUE > 3
+
+
+@pytest.mark.asyncio
+async def test_max_backoff(event_loop, scheduler):
+    scheduler.max_backoff = 0.05
+    settings = CountingSettings(event_loop, 0.02, fail=100, scheduler=scheduler)
+    await settings.start_update()
+    await asyncio.sleep(0.3)
+
+    assert scheduler.stats(settings).failures >= 5
+
+
+@pytest.mark.parametrize('backoff_factor', [2, 1.5])
+def test_backoff_of_many_failures(event_loop, backoff_factor):
+    scheduler = RefreshScheduler(loop=event_loop, jitter=0, backoff_factor=backoff_factor, max_backoff=60)
+    entry = _Entry(None, 0.5)
+    for failures in (1, 10, 2000, 10 ** 9):
+        entry.consecutive_failures = failures
+        assert 0.5 < scheduler._delay(entry) <= 60
+    assert scheduler._delay(entry) == 60
+
+
+@pytest.mark.asyncio
+async def test_scheduling_error_keeps_settings(event_loop, scheduler, monkeypatch):
+    def fail(entry):
+        raise ArithmeticError('delay')
+
+    monkeypatch.setattr(scheduler, '_delay', fail)
+    settings = CountingSettings(event_loop, 0.02, scheduler=scheduler)
+    await settings.start_update()
+    await asyncio.sleep(0.15)
+
+    assert settings.calls >= 3
+    assert scheduler.stats(settings).refreshes == settings.calls
+
+
+@pytest.mark.asyncio
+async def test_stop_update(event_loop, scheduler):
+    settings = CountingSettings(event_loop, 0.02, scheduler=scheduler)
+    await settings.start_update()
+    await asyncio.sleep(0.1)
+    await settings.stop_update()
+    calls = settings.calls
+    await asyncio.sleep(0.1)
+
+    assert settings.calls == calls
+    with pytest.raises(KeyError):
+        scheduler.stats(settings)
+
+
+@pytest.mark.asyncio
+async def test_jitter(event_loop, scheduler):
+    scheduler.jitter = 0.5
+    settings = [CountingSettings(event_loop, 10, scheduler=scheduler) for _ in range(10)]
+    for item in settings:
+        await item.start_update()
+
+    assert len({scheduler.stats(item).next_refresh for item in settings}) == 10
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        RefreshScheduler(jitter=1)
+    with pytest.raises(ValueError):
+        RefreshScheduler(backoff_factor=0.5)
+
+
+@pytest.mark.asyncio
+async def test_process_wide_scheduler(event_loop):
+    settings = CountingSettings(event_loop, 0.02, scheduler=True)
+    assert settings.scheduler is get_scheduler()
+
+    await settings.start_update()
+    await asyncio.sleep(0.1)
+    await settings.stop_update()
+
+    assert settings.calls >= 1
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import json
+import types
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseSettings, ComplexProperty, Property, TransformsProperty
+
+
+class Settings(BaseSettings):
+    HOST = Property(types=str, default='localhost')
+    PORT = Property(types=int, converts=[int], default=80)
+    NAME = TransformsProperty(types=str, default='name', transforms=[str.upper])
+    ADDRESS = ComplexProperty(keys={'host': HOST, 'port': PORT})
+
+
+@pytest.fixture
+def settings():
+    return Settings(modules=[types.ModuleType('serialization_settings')])
+
+
+def test_to_dict_cached_until_set(settings):
+    assert settings.to_dict()['properties']['PORT'] == 80
+    with mock.patch.object(Settings, 'HOST', new_callable=mock.PropertyMock) as host:
+        settings.to_dict()
+    host.assert_not_called()
+
+    settings.PORT = 81
+    assert settings.to_dict()['properties']['PORT'] == 81
+    assert settings.to_dict()['properties']['ADDRESS'] == {'host': 'localhost', 'port': 81}
+
+
+def test_to_json_cached_until_set(settings):
+    first = settings.to_json()
+    assert settings.to_json() is first
+
+    settings.update_config(PORT=81)
+    assert json.loads(settings.to_json())['properties']['PORT'] == 81
+    settings.apply_config(PORT=82)
+    assert json.loads(settings.to_json())['properties']['PORT'] == 82
+
+
+def test_to_dict_result_is_not_cache(settings):
+    result = settings.to_dict()
+    result['properties']['PORT'] = 0
+    result['sources'][0]['address']['name'] = 'other'
+    assert settings.to_dict() == {
+        'properties': {
+            'ADDRESS': {'host': 'localhost', 'port': 80}, 'HOST': 'localhost', 'NAME': 'NAME', 'PORT': 80,
+        },
+        'sources': [
+            {'source_type': 'module', 'address': {'name': 'serialization_settings'}},
+            {'source_type': 'dotenv', 'address': {'dotenv_path': None, 'override': False}},
+        ],
+    }
+
+
+def test_sources_change(settings):
+    settings.to_json()
+    settings.use_env = False
+    assert [source['source_type'] for source in json.loads(settings.to_json())['sources']] == ['module']
+
+
+def test_subset(settings):
+    assert settings.to_dict(names=['PORT', 'HOST'])['properties'] == {'HOST': 'localhost', 'PORT': 80}
+    assert json.loads(settings.to_json(['NAME']))['properties'] == {'NAME': 'NAME'}
+    with pytest.raises(ValueError):
+        settings.to_dict(names=['UNKNOWN'])
+
+
+def test_lazy_init_drops_cache(settings, monkeypatch):
+    settings.to_json()
+    monkeypatch.setenv('PORT', '81')
+    settings.init(lazy=True)
+    assert json.loads(settings.to_json())['properties']['PORT'] == 81
+
+
+def test_temp_values_are_not_cached(settings):
+    settings.to_json()
+    with settings.temp_set_attributes(PORT=81):
+        assert json.loads(settings.to_json())['properties']['PORT'] == 81
+    assert json.loads(settings.to_json())['properties']['PORT'] == 80
+
+
+def test_json_format(settings):
+    """Json is encoded as by json module, non-finite floats included"""
+    settings.update_config(HOST='хост')
+    assert settings.to_json().startswith('{"properties": {"ADDRESS": {"host": "хост", "port": 80}, "HOST": "хост"')
+
+    class RatioSettings(BaseSettings):
+        RATIO = Property(types=float, default=float('inf'))
+
+    assert json.dumps(RatioSettings().to_dict(), ensure_ascii=False) == RatioSettings().to_json()
+    assert '"RATIO": Infinity' in RatioSettings().to_json()
+
+
+def test_uncached_transforms_are_read_again():
+    counter = iter(range(10))
+
+    class CounterSettings(BaseSettings):
+        NAME = Property(types=str, default='t')
+        TAGGED = TransformsProperty(types=str, default='t', transforms=[lambda value: f'{value}-{next(counter)}'],
+                                    cached=False)
+        ADDRESS = ComplexProperty(keys={'name': NAME, 'tagged': TAGGED})
+
+    settings = CounterSettings()
+    assert settings.to_dict(['TAGGED'])['properties'] == {'TAGGED': 't-0'}
+    assert settings.to_dict(['TAGGED'])['properties'] == {'TAGGED': 't-1'}
+    assert json.loads(settings.to_json(['ADDRESS']))['properties'] == {'ADDRESS': {'name': 't', 'tagged': 't-2'}}
+    assert json.loads(settings.to_json(['ADDRESS']))['properties'] == {'ADDRESS': {'name': 't', 'tagged': 't-3'}}
+    first = settings.to_json(['NAME'])
+    assert settings.to_json(['NAME']) is first
+
+
+def test_values_changed_in_place():
+    class ListSettings(BaseSettings):
+        HOSTS = Property(types=list, default=[])
+        SERVERS = ComplexProperty(sequence=[HOSTS])
+
+    settings = ListSettings()
+    settings.HOSTS = ['a']
+    assert json.loads(settings.to_json())['properties']['HOSTS'] == ['a']
+    first = settings.to_json()
+    assert settings.to_json() is first
+
+    settings.HOSTS.append('b')
+    assert json.loads(settings.to_json())['properties'] == {'HOSTS': ['a', 'b'], 'SERVERS': [['a', 'b']]}
+    settings.HOSTS.append('c')
+    assert json.loads(settings.to_json(['SERVERS']))['properties'] == {'SERVERS': [['a', 'b', 'c']]}
+    assert settings.to_dict()['properties']['HOSTS'] == ['a', 'b', 'c']
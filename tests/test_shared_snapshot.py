@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+import mmap
+import os
+import subprocess
+import sys
+import textwrap
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseSettings, Property, SharedSnapshot, SnapshotError, StringListProperty, TransformsProperty
+from magic_settings import snapshot as snapshot_module
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Settings(BaseSettings):
+    HOST = Property(types=str, default='localhost')
+    PORT = Property(types=int, converts=[int], default=80)
+    HOSTS = StringListProperty(default=[])
+    UPPER_HOST = TransformsProperty(types=str, default='localhost', transforms=[str.upper])
+
+
+class OtherSettings(BaseSettings):
+    HOST = Property(types=str)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'settings.snapshot')
+
+
+@pytest.fixture
+def published(path):
+    settings = Settings()
+    settings.update_config(HOST='example.com', PORT='81', HOSTS='a,b', UPPER_HOST='example.com')
+    shared = SharedSnapshot.create(path, Settings)
+    shared.publish(settings)
+    yield shared
+    shared.close()
+
+
+def test_update(published, path):
+    shared = SharedSnapshot.attach(path, Settings)
+    settings = Settings()
+    with mock.patch('magic_settings.utils.BaseProperty.__set__') as set_value:
+        assert shared.update(settings)
+    set_value.assert_not_called()
+
+    assert settings.HOST == 'example.com'
+    assert settings.PORT == 81
+    assert settings.HOSTS == ['a', 'b']
+    assert settings.UPPER_HOST == 'EXAMPLE.COM'
+    assert not shared.update(settings)
+
+
+def test_refresh_is_seen(published, path):
+    shared = SharedSnapshot.attach(path, Settings)
+    settings = Settings()
+    shared.update(settings)
+    assert settings.UPPER_HOST == 'EXAMPLE.COM'
+
+    master = Settings()
+    master.update_config(PORT=82, UPPER_HOST='new.example.com')
+    published.publish(master)
+
+    assert shared.update(settings)
+    assert settings.PORT == 82
+    assert settings.UPPER_HOST == 'NEW.EXAMPLE.COM'
+
+
+def test_not_published(path):
+    SharedSnapshot.create(path, Settings)
+    shared = SharedSnapshot.attach(path, Settings)
+    settings = Settings()
+    assert not shared.update(settings)
+    assert settings.PORT == 80
+
+
+def test_schema_mismatch(published, path):
+    shared = SharedSnapshot.attach(path, OtherSettings)
+    with pytest.raises(SnapshotError):
+        shared.update(OtherSettings())
+
+
+class DeclaredSettings(BaseSettings):
+    LEVEL = Property(types=str, choices=['info', 'warning'], default='info')
+    N = Property(types=int, validators=[lambda value: value > 0])
+    TAGS = Property(types=frozenset, default=frozenset({'a', 'b', 'c'}))
+
+
+def test_schema_hash():
+    class ChangedSettings(Settings):
+        PORT = Property(types=str)
+
+    assert snapshot_module.schema_hash(Settings) == snapshot_module.schema_hash(Settings)
+    assert snapshot_module.schema_hash(Settings) != snapshot_module.schema_hash(ChangedSettings)
+
+
+def renamed(function, like):
+    """Function with the same qualified name as another one"""
+    function.__qualname__ = like.__qualname__
+    return function
+
+
+@pytest.mark.parametrize('name, _property', [
+    ('LEVEL', Property(types=str, choices=['warning', 'error'], default='warning')),
+    ('LEVEL', Property(types=str, choices=['info', 'warning'], default='warning')),
+    ('N', Property(types=int, validators=[renamed(lambda value: value > 1, DeclaredSettings.N.validators[0])])),
+    ('TAGS', Property(types=frozenset, default=frozenset({'a', 'b'}))),
+])
+def test_schema_hash_changes(name, _property):
+    ChangedSettings = type('DeclaredSettings', (BaseSettings,), dict(DeclaredSettings._properties, **{name: _property}))
+    ChangedSettings.__qualname__ = DeclaredSettings.__qualname__
+    ChangedSettings.__module__ = DeclaredSettings.__module__
+    assert snapshot_module.schema_hash(ChangedSettings) != snapshot_module.schema_hash(DeclaredSettings)
+
+
+def test_schema_hash_other_process():
+    code = textwrap.dedent('''
+        from magic_settings import snapshot
+        from test_shared_snapshot import DeclaredSettings
+        print(snapshot.schema_hash(DeclaredSettings).hex())
+    ''')
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR, PYTHONHASHSEED='random')
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.join(PROJECT_DIR, 'tests'), env=env,
+                            stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    assert result.stdout.strip() == snapshot_module.schema_hash(DeclaredSettings).hex()
+
+
+def test_attach_errors(tmp_path):
+    with pytest.raises(SnapshotError):
+        SharedSnapshot.attach(str(tmp_path / 'missing'), Settings)
+
+    path = tmp_path / 'not_snapshot'
+    path.write_bytes(b'x' * 100)
+    with pytest.raises(SnapshotError):
+        SharedSnapshot.attach(str(path), Settings)
+
+
+def test_attach_short_file(tmp_path):
+    mappings = []
+
+    class Mapping(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            mappings.append(self)
+
+    path = tmp_path / 'short'
+    path.write_bytes(b'x' * 10)
+    with mock.patch('mmap.mmap', Mapping), pytest.raises(SnapshotError):
+        SharedSnapshot.attach(str(path), Settings)
+    assert mappings and mappings[0].closed
+
+
+def test_attached_read_only(published, path):
+    shared = SharedSnapshot.attach(path, Settings)
+    with pytest.raises(SnapshotError):
+        shared.publish(Settings())
+
+
+def test_size_limit(path):
+    shared = SharedSnapshot.create(path, Settings, size=16)
+    with pytest.raises(ValueError):
+        shared.publish(Settings())
+
+
+def test_read_timeout(published):
+    # sequence number left odd by a publisher which died while writing
+    snapshot_module._HEADER.pack_into(published._mapping, 0, snapshot_module._MAGIC, 1, 3, 0, b'')
+    with pytest.raises(SnapshotError):
+        published.read(timeout=0.01)
+
+
+def test_other_process(published, path):
+    code = textwrap.dedent(f'''
+        from magic_settings import SharedSnapshot
+        from test_shared_snapshot import Settings
+        settings = Settings()
+        SharedSnapshot.attach({path!r}, Settings).update(settings)
+        print(settings.HOST, settings.PORT)
+    ''')
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.join(PROJECT_DIR, 'tests'), env=env,
+                            stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    assert result.stdout.strip() == 'example.com 81'
+
+
+def test_unpickling_error(published, path):
+    # payload of the same length which is not a pickle
+    _, _, _, length, _ = snapshot_module._HEADER.unpack_from(published._mapping, 0)
+    published._mapping[snapshot_module._HEADER.size:snapshot_module._HEADER.size + length] = b'x' * length
+    with pytest.raises(SnapshotError):
+        SharedSnapshot.attach(path, Settings).update(Settings())
+
+
+def test_create_replaces_file(published, path):
+    """Workers attached to the previous file keep reading it"""
+    attached = SharedSnapshot.attach(path, Settings)
+    inode = os.stat(path).st_ino
+    shared = SharedSnapshot.create(path, Settings)
+
+    assert os.stat(path).st_ino != inode
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+    settings = Settings()
+    assert attached.update(settings)
+    assert settings.HOST == 'example.com'
+    assert SharedSnapshot.attach(path, Settings).read() == (0, None)
+    shared.close()
+
+
+def test_sequence_is_written_last(published):
+    """Readers seeing even sequence number see length and schema of its values"""
+    headers = []
+
+    class Sequence:
+        def __getattr__(self, name):
+            return getattr(sequence, name)
+
+        def pack_into(self, mapping, offset, value):
+            headers.append(snapshot_module._HEADER.unpack_from(mapping, 0))
+            sequence.pack_into(mapping, offset, value)
+
+    sequence = snapshot_module._SEQUENCE
+    settings = Settings()
+    settings.HOST = 'other.example.com'
+    with mock.patch.object(snapshot_module, '_SEQUENCE', Sequence()):
+        published.publish(settings)
+
+    _, _, number, length, schema = snapshot_module._HEADER.unpack_from(published._mapping, 0)
+    assert number == 4
+    # header before the even sequence number is written
+    assert headers[-1][2:] == (3, length, schema)
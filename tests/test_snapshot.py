@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import threading
+import types
+from unittest import mock
+
+import pytest
+
+from magic_settings import (BaseSettings, ComplexProperty, FrozenSettings, Property, StringListProperty,
+                            TransformsComplexProperty)
+
+
+class Settings(BaseSettings):
+    HOST = Property(types=str, default='localhost')
+    PORT = Property(types=int, converts=[int], default=80)
+    HOSTS = StringListProperty(default=[])
+    ADDRESS = ComplexProperty(keys={'host': HOST, 'port': PORT})
+
+
+@pytest.fixture
+def settings():
+    return Settings()
+
+
+def test_snapshot(settings):
+    snapshot = settings.snapshot()
+    assert isinstance(snapshot, FrozenSettings)
+    assert snapshot.HOST == 'localhost'
+    assert snapshot.ADDRESS == {'host': 'localhost', 'port': 80}
+    with pytest.raises(AttributeError):
+        snapshot.HOST = 'example.com'
+
+
+def test_snapshot_is_published_by_updates(settings):
+    first = settings.snapshot()
+    assert settings.snapshot() is first
+
+    settings.update_config(HOST='example.com', PORT='81')
+    second = settings.snapshot()
+    assert second is not first
+    assert (second.HOST, second.PORT) == ('example.com', 81)
+    assert (first.HOST, first.PORT) == ('localhost', 80)
+
+    settings.apply_config(PORT=82)
+    assert settings.snapshot().PORT == 82
+
+
+def test_snapshot_is_not_published_by_attribute_set(settings):
+    snapshot = settings.snapshot()
+    settings.PORT = 81
+    assert settings.snapshot() is snapshot
+    assert snapshot.PORT == 80
+
+
+def test_snapshot_published_by_init(monkeypatch):
+    module = types.ModuleType('snapshot_settings')
+    module.PORT = 81
+    settings = Settings(modules=[module])
+    snapshot = settings.snapshot()
+    settings.init()
+    assert snapshot.PORT == 80
+    assert settings.snapshot().PORT == 81
+
+
+def test_failed_update_keeps_snapshot(settings):
+    snapshot = settings.snapshot()
+    with pytest.raises(ValueError):
+        settings.apply_config(HOST='example.com', PORT='http')
+    assert settings.snapshot() is snapshot
+
+
+def test_frozen_values(settings):
+    settings.update_config(HOSTS='a,b')
+    snapshot = settings.snapshot()
+    assert snapshot.HOSTS == ('a', 'b')
+    assert isinstance(snapshot.ADDRESS, types.MappingProxyType)
+    with pytest.raises(TypeError):
+        snapshot.ADDRESS['host'] = 'example.com'
+
+
+def test_unchanged_values_are_shared(settings):
+    settings.update_config(HOSTS='a,b')
+    first = settings.snapshot()
+    settings.update_config(PORT=81)
+    assert settings.snapshot().HOSTS is first.HOSTS
+
+
+def test_values_changed_in_place_are_published(settings):
+    settings.update_config(HOSTS='a,b')
+    first = settings.snapshot()
+    settings.HOSTS.append('c')
+    settings.update_config(PORT=81)
+
+    assert first.HOSTS == ('a', 'b')
+    assert settings.snapshot().HOSTS == ('a', 'b', 'c')
+
+
+def test_no_snapshots_until_requested(settings):
+    settings.update_config(PORT=81)
+    assert settings._snapshot is None
+
+
+def test_concurrent_readers_see_consistent_values(settings):
+    settings.snapshot()
+    stop = threading.Event()
+    mismatches = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = settings.snapshot()
+            if snapshot.PORT != int(snapshot.HOST):
+                mismatches.append((snapshot.HOST, snapshot.PORT))
+
+    settings.update_config(HOST='0', PORT=0)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(1, 2000):
+        settings.update_config(HOST=str(i), PORT=i)
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert mismatches == []
+
+
+def test_temp_values_are_not_published(settings):
+    settings.snapshot()
+    with settings.temp_set_attributes(HOST='temp'):
+        settings.update_config(PORT=81)
+    snapshot = settings.snapshot()
+    assert (snapshot.HOST, snapshot.PORT) == ('localhost', 81)
+
+
+def test_init_publishes_once():
+    module = types.ModuleType('snapshot_settings')
+    module.HOST = 'example.com'
+    module.PORT = 81
+    settings = Settings(modules=[module])
+    settings.snapshot()
+    with mock.patch.object(Settings, '_publish', autospec=True) as publish:
+        settings.init()
+    publish.assert_called_once_with(settings)
+
+
+def test_lazy_values_are_not_resolved_by_publishing():
+    class LazySettings(Settings):
+        URL = TransformsComplexProperty(sequence=[Settings.HOST, Settings.PORT],
+                                        transforms=[lambda host, port: f'{host}:{port}'])
+
+    module = types.ModuleType('snapshot_settings')
+    module.PORT = '81'
+    module.HOSTS = 'a,b'
+    settings = LazySettings(modules=[module])
+    settings.snapshot()
+    settings.init(lazy=True)
+    assert set(settings._lazy_values) == {'PORT', 'HOSTS'}
+
+    snapshot = settings.snapshot()
+    assert snapshot.HOST == 'localhost'
+    assert snapshot.URL == 'localhost:81'
+    assert snapshot.HOSTS == ('a', 'b')
+    assert set(settings._lazy_values) == {'PORT', 'HOSTS'}
+
+    settings.update_config(PORT=82)
+    assert snapshot.PORT == 81
+    assert settings.snapshot().URL == 'localhost:82'
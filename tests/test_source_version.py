@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+import pytest
+
+from magic_settings import BaseDynamicSettings, Property, SettingsValidationError
+
+
+class PayloadSettings(BaseDynamicSettings):
+    HOST = Property(types=str)
+    PORT = Property(types=int, converts=[int])
+
+    def __init__(self, loop, update_period, payloads):
+        super().__init__(loop, update_period)
+        self.payloads = payloads
+
+    async def update_settings_from_source(self):
+        payload, version = self.payloads.pop(0)
+        self.apply_source_payload(payload, version)
+
+
+class ConditionalSettings(PayloadSettings):
+    async def update_settings_from_source(self):
+        """Backend returns None if version passed is current"""
+        version, payload = self.payloads.pop(0)
+        if version == self.source_version:
+            return
+        self.apply_source_payload(payload, version)
+
+
+@pytest.fixture
+def settings(event_loop):
+    return PayloadSettings(event_loop, 1, [])
+
+
+def test_apply_payload(settings):
+    assert settings.apply_source_payload({'HOST': 'localhost', 'PORT': '80'}, version='v1')
+    assert settings.source_version == 'v1'
+    assert settings.PORT == 80
+
+
+def test_same_version_is_skipped(settings):
+    settings.apply_source_payload({'HOST': 'localhost', 'PORT': '80'}, version='v1')
+    with mock.patch.object(PayloadSettings, 'apply_config') as apply_config:
+        assert not settings.apply_source_payload({'HOST': 'localhost', 'PORT': '81'}, version='v1')
+    apply_config.assert_not_called()
+    assert settings.PORT == 80
+
+
+def test_new_version_is_applied(settings):
+    settings.apply_source_payload({'HOST': 'localhost', 'PORT': '80'}, version='v1')
+    assert settings.apply_source_payload({'HOST': 'localhost', 'PORT': '81'}, version='v2')
+    assert settings.PORT == 81
+
+
+def test_content_hash(settings):
+    assert settings.apply_source_payload({'HOST': 'localhost', 'PORT': '80'})
+    assert settings.source_version is not None
+    assert not settings.apply_source_payload({'PORT': '80', 'HOST': 'localhost'})
+    assert settings.apply_source_payload({'HOST': 'localhost', 'PORT': '81'})
+    assert settings.PORT == 81
+
+
+def test_unhashable_payload_is_always_applied(settings):
+    payload = {'HOST': 'localhost', 'PORT': {1: 'a', 'b': 'c'}}
+    with mock.patch.object(PayloadSettings, 'apply_config') as apply_config:
+        assert settings.apply_source_payload(payload)
+        assert settings.apply_source_payload(payload)
+    assert apply_config.call_count == 2
+
+
+def test_invalid_payload_keeps_version(settings):
+    settings.apply_source_payload({'HOST': 'localhost', 'PORT': '80'}, version='v1')
+    with pytest.raises(SettingsValidationError):
+        settings.apply_source_payload({'HOST': 'localhost', 'PORT': 'http'}, version='v2')
+    assert settings.source_version == 'v1'
+    assert settings.PORT == 80
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetch(event_loop):
+    settings = ConditionalSettings(event_loop, 1, [
+        ('v1', {'HOST': 'localhost', 'PORT': '80'}),
+        ('v1', None),
+        ('v2', {'HOST': 'localhost', 'PORT': '81'}),
+    ])
+    calls = []
+    settings.subscribe(calls.append)
+
+    await settings.refresh()
+    assert await settings.refresh() == frozenset()
+    assert await settings.refresh() == {'PORT'}
+    assert settings.source_version == 'v2'
+    assert len(calls) == 2
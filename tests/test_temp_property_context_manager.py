@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import threading
 import time
 
 import pytest
-from magic_settings.utils import BaseSettings, Property
+from magic_settings.utils import BaseSettings, Property, TransformsProperty
 
 
 @pytest.fixture
@@ -11,6 +12,8 @@ def settings():
     class Settings(BaseSettings):
         FOO = Property(types=str, default='BAR')
         BAR = Property(types=str, default='FOO')
+        UPPER_FOO = TransformsProperty(types=str, default='bar', transforms=[str.upper])
+        NAME = 'name'
     settings = Settings()
     return settings
 
@@ -37,7 +40,7 @@ async def test_coro(event_loop, settings):
     with settings.temp_set_attributes(FOO='TEMP_FOO', BAR='TEMP_BAR'):
         before = time.monotonic()
         # Do some async stuff
-        await asyncio.sleep(0.1, loop=event_loop)
+        await asyncio.sleep(0.1)
         after = time.monotonic()
         assert after - before >= 0.1
 
@@ -46,3 +49,75 @@ async def test_coro(event_loop, settings):
 
     assert settings.FOO == 'BAR'
     assert settings.BAR == 'FOO'
+
+
+def test_restored_on_exception(settings):
+    """Test values are restored if the block raises"""
+    with pytest.raises(RuntimeError):
+        with settings.temp_set_attributes(FOO='TEMP_FOO', NAME='temp'):
+            raise RuntimeError
+    assert settings.FOO == 'BAR'
+    assert settings.NAME == 'name'
+
+
+def test_nested(settings):
+    with settings.temp_set_attributes(FOO='OUTER', BAR='OUTER'):
+        with settings.temp_set_attributes(FOO='INNER'):
+            assert settings.FOO == 'INNER'
+            assert settings.BAR == 'OUTER'
+        assert settings.FOO == 'OUTER'
+    assert settings.FOO == 'BAR'
+
+
+def test_invalid_value(settings):
+    with pytest.raises(ValueError):
+        with settings.temp_set_attributes(FOO=1):
+            pass
+    assert settings.FOO == 'BAR'
+
+
+def test_transforms_property(settings):
+    assert settings.UPPER_FOO == 'BAR'
+    with settings.temp_set_attributes(UPPER_FOO='temp'):
+        assert settings.UPPER_FOO == 'TEMP'
+    assert settings.UPPER_FOO == 'BAR'
+
+
+def test_set_inside_block(settings):
+    """Values set inside the block are kept after it"""
+    with settings.temp_set_attributes(FOO='TEMP_FOO'):
+        settings.BAR = 'NEW'
+    assert settings.BAR == 'NEW'
+
+
+def test_threads_isolated(settings):
+    """Test overrides are visible only in the thread which made them"""
+    entered = threading.Event()
+    release = threading.Event()
+    seen = []
+
+    def override():
+        with settings.temp_set_attributes(FOO='THREAD_FOO'):
+            seen.append(settings.FOO)
+            entered.set()
+            release.wait()
+
+    thread = threading.Thread(target=override)
+    thread.start()
+    entered.wait()
+    assert settings.FOO == 'BAR'
+    release.set()
+    thread.join()
+    assert seen == ['THREAD_FOO']
+
+
+@pytest.mark.asyncio
+async def test_tasks_isolated(settings):
+    """Test concurrent tasks see own overrides"""
+    async def override(value):
+        with settings.temp_set_attributes(FOO=value):
+            await asyncio.sleep(0.01)
+            return settings.FOO
+
+    assert await asyncio.gather(override('ONE'), override('TWO')) == ['ONE', 'TWO']
+    assert settings.FOO == 'BAR'
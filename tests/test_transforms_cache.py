@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+import pytest
+
+from magic_settings import (BaseSettings, IntProperty, StringProperty, TransformsComplexProperty,
+                            TransformsProperty)
+
+
+def make_settings(cached=True):
+    dsn = mock.Mock(side_effect=lambda host, port: f'{host}:{port}')
+    upper = mock.Mock(side_effect=str.upper)
+    url = mock.Mock(side_effect=lambda dsn, name: f'http://{dsn}/{name}')
+
+    class Settings(BaseSettings):
+        HOST = StringProperty(default='localhost')
+        PORT = IntProperty(default=80)
+        NAME = TransformsProperty(types=str, default='index', transforms=[upper], cached=cached)
+        DSN = TransformsComplexProperty(keys={'host': HOST, 'port': PORT}, transforms=[dsn], cached=cached)
+        URL = TransformsComplexProperty(sequence=[DSN, NAME], transforms=[url], cached=cached)
+
+    return Settings(), dsn, upper, url
+
+
+@pytest.fixture
+def settings():
+    return make_settings()
+
+
+def test_cached_value(settings):
+    settings, dsn, upper, url = settings
+
+    for _ in range(3):
+        assert settings.DSN == 'localhost:80'
+        assert settings.NAME == 'INDEX'
+        assert settings.URL == 'http://localhost:80/INDEX'
+
+    assert dsn.call_count == 1
+    assert upper.call_count == 1
+    assert url.call_count == 1
+
+
+@pytest.mark.parametrize('name, value, expected, calls', [
+    ('HOST', 'example.com', 'http://example.com:80/INDEX', [2, 1, 2]),
+    ('PORT', '8080', 'http://localhost:8080/INDEX', [2, 1, 2]),
+    ('NAME', 'main', 'http://localhost:80/MAIN', [1, 2, 2]),
+])
+def test_invalidation(settings, name, value, expected, calls):
+    """Setting property drops cached values of transforms properties built from it"""
+    settings, dsn, upper, url = settings
+    assert settings.URL == 'http://localhost:80/INDEX'
+
+    setattr(settings, name, value)
+
+    assert settings.URL == expected
+    assert [dsn.call_count, upper.call_count, url.call_count] == calls
+
+
+def test_temp_set_attributes_invalidation(settings):
+    settings, dsn, _, _ = settings
+    assert settings.DSN == 'localhost:80'
+
+    with settings.temp_set_attributes(HOST='example.com'):
+        assert settings.DSN == 'example.com:80'
+    assert settings.DSN == 'localhost:80'
+    # overridden values are not cached and do not reset the cache
+    assert dsn.call_count == 2
+
+
+def test_cache_per_instance(settings):
+    settings, dsn, _, _ = settings
+    other = type(settings)()
+    other.HOST = 'example.com'
+
+    assert settings.DSN == 'localhost:80'
+    assert other.DSN == 'example.com:80'
+    assert dsn.call_count == 2
+
+
+def test_not_cached():
+    settings, dsn, upper, url = make_settings(cached=False)
+
+    for _ in range(3):
+        assert settings.URL == 'http://localhost:80/INDEX'
+
+    assert [dsn.call_count, upper.call_count, url.call_count] == [3, 3, 3]
+
+
+def test_class_access(settings):
+    settings, _, _, _ = settings
+
+    assert isinstance(type(settings).DSN, TransformsComplexProperty)